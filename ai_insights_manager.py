@@ -104,15 +104,17 @@ class AIInsightsManager:
         today = date.today()
         yesterday = today - timedelta(days=1)
         
+        summary = self.stats_manager.get_summary(today)
+        
         data = {
-            'today_stats': self.stats_manager.get_daily_stats(today),
+            'today_stats': summary['daily'],
             'yesterday_stats': self.stats_manager.get_daily_stats(yesterday),
             'weekly_stats': self.stats_manager.get_history_range(7),
             'monthly_stats': self.stats_manager.get_history_range(30),
             'hourly_patterns': self.stats_manager.get_hourly_stats(30),
             'day_patterns': self.stats_manager.get_day_of_week_stats(4),
             'streak': self.stats_manager.get_focus_streak(),
-            'all_time': self.stats_manager.get_all_time_stats(),
+            'all_time': summary['all_time'],
         }
         
         # Get tasks
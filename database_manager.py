@@ -4,6 +4,12 @@ from task import Task
 class DatabaseManager:
     def __init__(self, db_name="tasks.db"):
         self.conn = sqlite3.connect(db_name)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=2000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        # {date: {(hour, minute): title}} for burst voice commands; cleared on every write
+        self._event_times_cache = {}
         self.create_table()
 
     def create_table(self):
@@ -56,12 +62,32 @@ class DatabaseManager:
         """
         self.conn.execute(index_query)
         
+        # Index start_time so date-range lookups on events don't scan the table
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_start ON tasks(start_time)")
+        
         self.conn.commit()
 
+    INSERT_TASK_QUERY = "INSERT INTO tasks (title, start_time, completed, source, event_id, is_recurring, repeat_days, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+    @staticmethod
+    def _task_row(task: Task):
+        return (task.title, task.start_time, int(task.completed), task.source, task.event_id, int(task.is_recurring), task.repeat_days, task.priority)
+
+    def _invalidate_schedule_cache(self):
+        self._event_times_cache.clear()
+
     def add_task(self, task: Task):
-        query = "INSERT INTO tasks (title, start_time, completed, source, event_id, is_recurring, repeat_days, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
-        self.conn.execute(query, (task.title, task.start_time, int(task.completed), task.source, task.event_id, int(task.is_recurring), task.repeat_days, task.priority))
+        self.conn.execute(self.INSERT_TASK_QUERY, self._task_row(task))
         self.conn.commit()
+        self._invalidate_schedule_cache()
+
+    def add_tasks_bulk(self, tasks):
+        """Insert several tasks in a single transaction (one commit instead of one per task)."""
+        if not tasks:
+            return
+        with self.conn:
+            self.conn.executemany(self.INSERT_TASK_QUERY, [self._task_row(task) for task in tasks])
+        self._invalidate_schedule_cache()
 
     def get_all_tasks(self):
         cursor = self.conn.cursor()
@@ -79,10 +105,11 @@ class DatabaseManager:
         """Remove old Google Calendar events before syncing new ones."""
         self.conn.execute("DELETE FROM tasks WHERE source='google'")
         self.conn.commit()
+        self._invalidate_schedule_cache()
     
     def get_today_schedule(self, limit=3):
         """Get today's scheduled appointments/meetings (items with date and time), including recurring events."""
-        from datetime import date, datetime
+        from datetime import date, datetime, timedelta
         
         today = date.today()
         today_str = str(today)
@@ -95,11 +122,11 @@ class DatabaseManager:
             SELECT title, start_time
             FROM tasks
             WHERE start_time IS NOT NULL
-            AND DATE(start_time) = ?
+            AND start_time >= ? AND start_time < ?
             AND completed = 0
             AND (is_recurring = 0 OR is_recurring IS NULL)
             ORDER BY start_time ASC
-        """, (today_str,))
+        """, (today_str, str(today + timedelta(days=1))))
         
         events = list(cursor.fetchall())
         
@@ -159,6 +186,7 @@ class DatabaseManager:
         """, (task_id,))
         
         self.conn.commit()
+        self._invalidate_schedule_cache()
         return cursor.rowcount > 0
     
     def delete_task(self, task_id):
@@ -166,6 +194,7 @@ class DatabaseManager:
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
         self.conn.commit()
+        self._invalidate_schedule_cache()
         return cursor.rowcount > 0
     
     def update_task(self, task_id, title=None, start_time=None, is_recurring=None, repeat_days=None):
@@ -194,6 +223,7 @@ class DatabaseManager:
             query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
             self.conn.execute(query, params)
             self.conn.commit()
+            self._invalidate_schedule_cache()
     
     def add_schedule_item(self, task: Task):
         """Add a schedule item (appointment/meeting) with date and time.
@@ -201,6 +231,13 @@ class DatabaseManager:
         if not task.start_time:
             raise ValueError("Schedule items must have a start_time")
         self.add_task(task)
+
+    def add_schedule_items_bulk(self, tasks):
+        """Add several schedule items in a single transaction.
+        Note: every item must have a start_time."""
+        if any(not task.start_time for task in tasks):
+            raise ValueError("Schedule items must have a start_time")
+        self.add_tasks_bulk(tasks)
     
     def get_schedule_by_month(self, year, month):
         """Get all schedule items for a specific month, including recurring events."""
@@ -221,8 +258,7 @@ class DatabaseManager:
             SELECT id, title, start_time, source, completed, event_id, is_recurring, repeat_days
             FROM tasks
             WHERE start_time IS NOT NULL
-            AND DATE(start_time) >= ?
-            AND DATE(start_time) < ?
+            AND start_time >= ? AND start_time < ?
             AND completed = 0
             AND (is_recurring = 0 OR is_recurring IS NULL)
             ORDER BY start_time ASC
@@ -286,12 +322,11 @@ class DatabaseManager:
             SELECT id, title, start_time, source, completed, event_id, is_recurring, repeat_days
             FROM tasks
             WHERE start_time IS NOT NULL
-            AND DATE(start_time) >= ?
-            AND DATE(start_time) <= ?
+            AND start_time >= ? AND start_time < ?
             AND completed = 0
             AND (is_recurring = 0 OR is_recurring IS NULL)
             ORDER BY start_time ASC
-        """, (str(start_date), str(end_date)))
+        """, (str(start_date), str(end_date + timedelta(days=1))))
         
         events = list(cursor.fetchall())
         
@@ -339,7 +374,39 @@ class DatabaseManager:
         # Sort all events by start_time
         events.sort(key=lambda x: x[2] if x[2] else "")
         return events
-    
+
+    def get_event_times_on_date(self, event_date):
+        """Get a {(hour, minute): title} map of events on a date, including recurring events.
+        Used for conflict detection when adding events. Results are cached per date until
+        the next write, so callers must not mutate the returned dict."""
+        from datetime import datetime
+
+        cached = self._event_times_cache.get(event_date)
+        if cached is not None:
+            return cached
+
+        existing_events = self.get_schedule_by_date_range(event_date, event_date)
+
+        # Pre-parse all event times for faster comparison (first title wins per slot)
+        event_times = {}
+        # Rows are (id, title, start_time, ...) with a fixed arity, so unpack instead of indexing
+        for _id, title, start_time, *_ in existing_events:
+            if start_time:
+                try:
+                    existing_dt = datetime.fromisoformat(start_time)
+                    if existing_dt.date() == event_date:
+                        time_key = (existing_dt.hour, existing_dt.minute)
+                        if time_key not in event_times:
+                            event_times[time_key] = title or "an event"
+                except:
+                    pass
+
+        # Keep the cache small; voice bursts only ever touch a handful of dates
+        if len(self._event_times_cache) >= 32:
+            self._event_times_cache.clear()
+        self._event_times_cache[event_date] = event_times
+        return event_times
+
     def get_schedule_item_by_id(self, task_id):
         """Get single schedule item by ID for editing."""
         cursor = self.conn.cursor()
@@ -365,7 +432,7 @@ class DatabaseManager:
     
     def get_today_schedule_full(self, limit=3):
         """Get today's schedule with full data (id, source, etc.), including recurring events."""
-        from datetime import date, datetime
+        from datetime import date, datetime, timedelta
         
         today = date.today()
         today_str = str(today)
@@ -378,11 +445,11 @@ class DatabaseManager:
             SELECT id, title, start_time, source, completed, event_id, is_recurring, repeat_days
             FROM tasks
             WHERE start_time IS NOT NULL
-            AND DATE(start_time) = ?
+            AND start_time >= ? AND start_time < ?
             AND completed = 0
             AND (is_recurring = 0 OR is_recurring IS NULL)
             ORDER BY start_time ASC
-        """, (today_str,))
+        """, (today_str, str(today + timedelta(days=1))))
         
         events = list(cursor.fetchall())
         
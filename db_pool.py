@@ -0,0 +1,51 @@
+import sqlite3
+import threading
+from typing import Dict
+
+
+# One shared connection per database path, created on first use
+_connections: Dict[str, sqlite3.Connection] = {}
+_lock = threading.Lock()
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune a freshly opened connection (runs once per path)."""
+    # WAL is persistent in the database file, so only switch when it isn't set yet
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=134217728")
+    conn.execute("PRAGMA busy_timeout=5000")
+
+
+def get_connection(db_path: str = "tasks.db") -> sqlite3.Connection:
+    """Return the process-wide connection for `db_path`, opening it on first use.
+
+    The connection runs in autocommit mode (isolation_level=None) with
+    sqlite3.Row rows and may be used from any thread.
+    """
+    conn = _connections.get(db_path)
+    if conn is not None:
+        return conn
+    with _lock:
+        conn = _connections.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            _apply_pragmas(conn)
+            _connections[db_path] = conn
+        return conn
+
+
+def close_connection(db_path: str = "tasks.db") -> None:
+    """Close and forget the shared connection for `db_path` (no-op if not open)."""
+    with _lock:
+        conn = _connections.pop(db_path, None)
+    if conn is not None:
+        conn.close()
+
+
+__all__ = ["get_connection", "close_connection"]
@@ -532,6 +532,7 @@ class EventManager:
             self.app.db.add_schedule_item(task)
             
             # Refresh calendar to show dots on new event dates
+            self.app.load_calendar_events()  # Rebuild the in-memory event cache
             self.app.calendar_manager.load_calendar_month(self.app.selected_year, self.app.selected_month)
             popup.dismiss()
             
@@ -632,6 +633,7 @@ class EventManager:
             )
             
             # Refresh calendar
+            self.app.load_calendar_events()  # Rebuild the in-memory event cache
             self.app.calendar_manager.load_calendar_month(self.app.selected_year, self.app.selected_month)
             # Refresh day events popup if it's open
             self.app.calendar_manager.refresh_day_events_popup()
@@ -649,6 +651,7 @@ class EventManager:
         success = self.app.db.delete_task(event_id)
         if success:
             # Refresh calendar
+            self.app.load_calendar_events()  # Rebuild the in-memory event cache
             self.app.calendar_manager.load_calendar_month(self.app.selected_year, self.app.selected_month)
             # Update home screen schedule
             self.app.update_schedule_display()
@@ -755,6 +758,7 @@ class EventManager:
         success = self.app.db.delete_task(event_id)
         if success:
             # Refresh calendar
+            self.app.load_calendar_events()  # Rebuild the in-memory event cache
             self.app.calendar_manager.load_calendar_month(self.app.selected_year, self.app.selected_month)
             # Refresh day events popup if it's open
             self.app.calendar_manager.refresh_day_events_popup()
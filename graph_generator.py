@@ -165,8 +165,7 @@ class FocusGraphGenerator:
         # Group data by month
         monthly_totals = defaultdict(int)
         for date_str, stats in history_data.items():
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-            month_key = dt.strftime("%Y-%m")  # e.g., "2025-11"
+            month_key = date_str[:7]  # ISO date prefix, e.g., "2025-11"
             monthly_totals[month_key] += stats["pomodoros"]
         
         # Sort by date and prepare data
@@ -178,7 +177,7 @@ class FocusGraphGenerator:
         # Format month labels (e.g., "Nov", "Dec")
         labels = []
         for month_key in recent_months:
-            dt = datetime.strptime(month_key + "-01", "%Y-%m-%d")
+            dt = datetime.fromisoformat(month_key + "-01")
             labels.append(dt.strftime("%b\n%Y"))
         
         # Create line chart
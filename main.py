@@ -1,4 +1,6 @@
 import os
+import string
+import logging
 from kivy.app import App
 from kivy.uix.widget import Widget
 from kivy.properties import ObjectProperty, StringProperty, ListProperty, NumericProperty, BooleanProperty, DictProperty
@@ -16,6 +18,7 @@ from timer import PomodoroTimer
 from stats_manager import FocusStatsManager
 from graph_generator import FocusGraphGenerator
 from database_manager import DatabaseManager
+from db_pool import close_connection
 from profile_manager import ProfileManager
 from notification_manager import NotificationManager
 from notification_service import NotificationService
@@ -26,6 +29,9 @@ from calendar_manager import CalendarManager
 from event_manager import EventManager
 from ai_insights_manager import AIInsightsManager
 from datetime import datetime, date, timedelta
+from threading import current_thread, main_thread, Event
+from concurrent.futures import Future
+from collections import defaultdict
 # Note: calendar module is now only used in calendar_manager.py
 
 # Load the KV files that define the UI
@@ -38,6 +44,98 @@ Builder.load_file('terms_conditions.kv')
 Builder.load_file('voice_chat.kv')
 # Note: ai_insights.kv is included via design.kv, no need to load separately
 
+_log = logging.getLogger(__name__)
+
+# Cached so voice commands can detect background threads with an identity check
+_MAIN_THREAD = main_thread()
+
+# Lookup tables for voice date/time parsing (module-level so they are built once)
+_DAY_NAMES = {
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6
+}
+
+_MONTH_NAMES = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+
+# ASCII-only lowercasing for voice transcripts (all lookup keys above are ASCII)
+_LOWER_TBL = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _format_time_12h(dt):
+    """Format a datetime as e.g. "4:05 PM" (same as strftime("%I:%M %p").lstrip('0'), without strftime)."""
+    hour_12 = dt.hour % 12 or 12
+    am_pm = "AM" if dt.hour < 12 else "PM"
+    return f"{hour_12}:{dt.minute:02d} {am_pm}"
+
+
+def _safe_close(conn, label):
+    """Close a database connection during shutdown, logging instead of raising."""
+    try:
+        conn.close()
+        print(f"[CLEANUP] Closed {label} database")
+    except Exception as e:
+        print(f"[CLEANUP] Error closing {label} database: {e}")
+
+
+# Minute offsets tried when suggesting an alternative to a conflicting event time
+_TIME_OFFSETS = (-60, -30, 30, 60)
+_AMPM_FMTS = ('%I%p', '%I:%M%p', '%I:%M:%S%p')
+_24H_FMTS = ('%H:%M:%S', '%H:%M')
+
+# Daily notification windows in minutes since midnight (goal reminder, streak alert)
+_MORNING_START_MIN = 9 * 60
+_MORNING_END_MIN = 10 * 60
+_EVENING_START_MIN = 20 * 60
+_EVENING_END_MIN = 21 * 60
+
+# Event popup/picker callbacks used from kv; bound straight to EventManager in build()
+_DELEGATED_TO_EVENT_MANAGER = (
+    'open_create_event_popup',
+    'open_date_picker_for_event',
+    'date_picker_prev_month',
+    'date_picker_next_month',
+    'render_date_picker_calendar',
+    'select_date_from_picker',
+    'confirm_date_selection',
+    'open_time_picker_for_event',
+    'render_time_picker',
+    'scroll_to_selected_time',
+    'select_hour',
+    'select_minute',
+    'select_ampm',
+    'update_time_picker_highlighting',
+    'update_time_display',
+    'confirm_time_selection',
+    'on_recurring_toggle_changed',
+    'on_repeat_day_changed',
+    'create_event_from_popup',
+    'show_error_popup',
+    'open_date_picker_for_edit_event',
+    'open_time_picker_for_edit_event',
+    'update_event_from_popup',
+    'delete_event',
+    'open_event_actions_popup',
+    'edit_event_from_day_popup',
+    'delete_event_from_day_popup',
+)
 
 class HomeScreen(BoxLayout):
     pass
@@ -250,6 +348,9 @@ class Home(App):
         self.notification_service = NotificationService(self.notification_manager)
         self.calendar_manager = CalendarManager(self)
         self.event_manager = EventManager(self)
+        # Bind event management methods directly instead of through one-line forwarders
+        for name in _DELEGATED_TO_EVENT_MANAGER:
+            setattr(self, name, getattr(self.event_manager, name))
         
         # Initialize AI voice assistant (DeepSeek cloud API)
         # Get your DeepSeek API key at: https://platform.deepseek.com/
@@ -355,8 +456,9 @@ class Home(App):
     
     def open_stats_popup(self):
         """Open detailed statistics popup with daily and all-time stats."""
-        daily_stats = self.stats_manager.get_daily_stats()
-        alltime_stats = self.stats_manager.get_all_time_stats()
+        summary = self.stats_manager.get_summary()
+        daily_stats = summary['daily']
+        alltime_stats = summary['all_time']
         
         # Create popup using KV template
         popup = Factory.StatsPopup()
@@ -385,11 +487,17 @@ class Home(App):
         except:
             self._cached_week_stats = {'pomodoros': 0, 'focus_minutes': 0}
         
-        # Cache streak
+        # Cache streak, plus the voice reply so get_streak_voice is a plain attribute read
         try:
             self._cached_streak = self.stats_manager.get_focus_streak()
         except:
             self._cached_streak = {'current': 0, 'best': 0}
+        current = self._cached_streak['current']
+        best = self._cached_streak['best']
+        if current > 0:
+            self._cached_streak_voice = f"Your current streak is {current} days! Best: {best} days"
+        else:
+            self._cached_streak_voice = f"Start a focus session today to begin your streak! Best: {best} days"
     
     def _switch_tab(self, popup, active_tab):
         """Update tab button active states."""
@@ -447,10 +555,15 @@ class Home(App):
             events = self.db.get_schedule_by_date_range(today - timedelta(days=30), end_date)
             
             # Convert to list of dicts for easy access
-            self.calendar_events = []
+            calendar_events = []
             for event in events:
                 # event is a tuple: (id, title, start_time, source, description, location, is_recurring, repeat_days)
-                self.calendar_events.append({
+                # Parse start_time once here so voice queries and list rendering never re-parse it
+                try:
+                    start_dt = datetime.fromisoformat(event[2]) if event[2] else None
+                except ValueError:
+                    start_dt = None
+                calendar_events.append({
                     'id': event[0],
                     'title': event[1],
                     'start_time': event[2],
@@ -458,8 +571,24 @@ class Home(App):
                     'description': event[4] if len(event) > 4 else '',
                     'location': event[5] if len(event) > 5 else '',
                     'is_recurring': event[6] if len(event) > 6 else False,
-                    'repeat_days': event[7] if len(event) > 7 else None
+                    'repeat_days': event[7] if len(event) > 7 else None,
+                    '_dt': start_dt,
+                    '_date': start_dt.date() if start_dt else None,
+                    '_date_key': start_dt.date().isoformat() if start_dt else None,
+                    '_time_str': _format_time_12h(start_dt) if start_dt else ''
                 })
+            # Recurring events come back after the dated ones; sort once here so consumers can
+            # stream the list in order (lexical order of ISO strings is chronological)
+            calendar_events.sort(key=lambda e: e['start_time'] or '')
+            self.calendar_events = calendar_events
+            
+            # Day slices for voice queries
+            events_by_date_key = defaultdict(list)
+            for event in calendar_events:
+                date_key = event['_date_key']
+                if date_key:
+                    events_by_date_key[date_key].append(event)
+            self._events_by_date_key = dict(events_by_date_key)
             
             print(f"Loaded {len(self.calendar_events)} calendar events")
         except Exception as e:
@@ -467,6 +596,7 @@ class Home(App):
             import traceback
             traceback.print_exc()
             self.calendar_events = []
+            self._events_by_date_key = {}
     
     def update_schedule_display(self):
         """Update Today's Schedule from database with calendar events."""
@@ -1347,8 +1477,22 @@ class Home(App):
                 login_screen.ids.login_error.text = 'Please enter both username and password'
                 return
             
-            # Authenticate using ProfileManager
-            if self.profile_manager.authenticate(username, password):
+            # Authenticate using ProfileManager; password hashing runs off the UI thread
+            # and the result is applied back on the main thread
+            future = self.profile_manager.authenticate_async(username, password)
+            future.add_done_callback(
+                lambda fut: Clock.schedule_once(lambda dt: self._finish_login(fut), 0))
+        except Exception as e:
+            print(f"Login error: {e}")
+            login_screen = self.root.get_screen('login')
+            login_screen.ids.login_error.text = 'Login failed'
+    
+    def _finish_login(self, future):
+        """Apply an authenticate_async result to the login screen."""
+        login_screen = self.root.get_screen('login')
+        try:
+            # Any hash upgrade is written here, on the main thread that owns the connection
+            if self.profile_manager.complete_authentication(future.result()):
                 login_screen.ids.login_error.text = ''
                 login_screen.ids.login_username.text = ''
                 login_screen.ids.login_password.text = ''
@@ -1357,7 +1501,6 @@ class Home(App):
                 login_screen.ids.login_error.text = 'Invalid username or password'
         except Exception as e:
             print(f"Login error: {e}")
-            login_screen = self.root.get_screen('login')
             login_screen.ids.login_error.text = 'Login failed'
     
     def skip_login(self):
@@ -1390,15 +1533,15 @@ class Home(App):
             prefs = self.notification_manager.get_preferences()
             
             # Update checkboxes
-            settings_screen.ids.session_reminders.active = prefs.get('session_reminders', True)
-            settings_screen.ids.break_reminders.active = prefs.get('break_reminders', True)
-            settings_screen.ids.daily_goals.active = prefs.get('daily_goals', True)
-            settings_screen.ids.streak_alerts.active = prefs.get('streak_alerts', True)
-            settings_screen.ids.task_deadlines.active = prefs.get('task_deadlines', True)
-            settings_screen.ids.weekly_summary.active = prefs.get('weekly_summary', False)
-            settings_screen.ids.achievements.active = prefs.get('achievements', True)
-            settings_screen.ids.notification_sound.active = prefs.get('notification_sound', True)
-            settings_screen.ids.quiet_hours_enabled.active = prefs.get('quiet_hours_enabled', False)
+            settings_screen.ids.session_reminders.active = prefs.session_reminders
+            settings_screen.ids.break_reminders.active = prefs.break_reminders
+            settings_screen.ids.daily_goals.active = prefs.daily_goals
+            settings_screen.ids.streak_alerts.active = prefs.streak_alerts
+            settings_screen.ids.task_deadlines.active = prefs.task_deadlines
+            settings_screen.ids.weekly_summary.active = prefs.weekly_summary
+            settings_screen.ids.achievements.active = prefs.achievements
+            settings_screen.ids.notification_sound.active = prefs.notification_sound
+            settings_screen.ids.quiet_hours_enabled.active = prefs.quiet_hours_enabled
         except Exception as e:
             print(f"Error loading notification preferences: {e}")
     
@@ -1959,10 +2102,9 @@ class Home(App):
         """Start timer via voice command (thread-safe)."""
         try:
             # Timer access must happen on main thread
-            from threading import current_thread, main_thread
-            if current_thread() != main_thread():
+            if current_thread() is not _MAIN_THREAD:
                 # We're in a background thread, need to start timer on main thread
-                result = [None]
+                fut = Future()
                 
                 def _start_on_main_thread(dt):
                     try:
@@ -1970,21 +2112,17 @@ class Home(App):
                         # Use reset() to set duration, then start()
                         self.timer.reset(minutes=duration)
                         self.timer.start()
-                        result[0] = 'success'
+                        fut.set_result('success')
                     except Exception as e:
-                        print(f"Error starting timer: {e}")
-                        result[0] = {'error': str(e)}
+                        _log.exception("Error starting timer")
+                        fut.set_exception(e)
                 
                 Clock.schedule_once(_start_on_main_thread, 0)
                 
-                # Wait for result (efficient polling with shorter intervals)
-                import time
-                start_time = time.time()
-                timeout = 0.3  # Reduced timeout
-                while result[0] is None and (time.time() - start_time) < timeout:
-                    time.sleep(0.01)  # Shorter sleep interval for better responsiveness
-                
-                if result[0] is None or isinstance(result[0], dict):
+                # Block until the main thread resolves the future (raises on error or timeout)
+                try:
+                    fut.result(timeout=0.3)
+                except Exception:
                     return "Could not start timer"
             else:
                 # Already on main thread
@@ -1993,46 +2131,37 @@ class Home(App):
                 self.timer.start()
             
             return f"Started {duration}-minute focus timer!"
-        except Exception as e:
-            print(f"Error starting timer: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error starting timer")
             return "Could not start timer"
     
     def stop_timer_voice(self) -> str:
         """Stop timer via voice command (thread-safe)."""
         try:
             # Timer access must happen on main thread
-            from threading import current_thread, main_thread
-            if current_thread() != main_thread():
+            if current_thread() is not _MAIN_THREAD:
                 # We're in a background thread, need to stop timer on main thread
-                result = [None]
+                fut = Future()
                 
                 def _stop_on_main_thread(dt):
                     try:
                         # Timer is stored as self.timer in the app
                         if self.timer.is_running:
                             self.timer.pause()
-                            result[0] = "Timer paused"
+                            fut.set_result("Timer paused")
                         else:
-                            result[0] = "Timer is not running"
+                            fut.set_result("Timer is not running")
                     except Exception as e:
-                        print(f"Error stopping timer: {e}")
-                        result[0] = {'error': str(e)}
+                        _log.exception("Error stopping timer")
+                        fut.set_exception(e)
                 
                 Clock.schedule_once(_stop_on_main_thread, 0)
                 
-                # Wait for result (efficient polling with shorter intervals)
-                import time
-                start_time = time.time()
-                timeout = 0.3  # Reduced timeout
-                while result[0] is None and (time.time() - start_time) < timeout:
-                    time.sleep(0.01)  # Shorter sleep interval for better responsiveness
-                
-                if result[0] is None or isinstance(result[0], dict):
+                # Block until the main thread resolves the future (raises on error or timeout)
+                try:
+                    return fut.result(timeout=0.3)
+                except Exception:
                     return "Could not stop timer"
-                
-                return result[0]
             else:
                 # Already on main thread
                 if self.timer.is_running:
@@ -2040,46 +2169,37 @@ class Home(App):
                     return "Timer paused"
                 else:
                     return "Timer is not running"
-        except Exception as e:
-            print(f"Error stopping timer: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error stopping timer")
             return "Could not stop timer"
     
     def resume_timer_voice(self) -> str:
         """Resume timer via voice command (thread-safe)."""
         try:
             # Timer access must happen on main thread
-            from threading import current_thread, main_thread
-            if current_thread() != main_thread():
+            if current_thread() is not _MAIN_THREAD:
                 # We're in a background thread, need to resume timer on main thread
-                result = [None]
+                fut = Future()
                 
                 def _resume_on_main_thread(dt):
                     try:
                         # Timer is stored as self.timer in the app
                         if not self.timer.is_running:
                             self.timer.start()
-                            result[0] = "Timer resumed"
+                            fut.set_result("Timer resumed")
                         else:
-                            result[0] = "Timer is already running"
+                            fut.set_result("Timer is already running")
                     except Exception as e:
-                        print(f"Error resuming timer: {e}")
-                        result[0] = {'error': str(e)}
+                        _log.exception("Error resuming timer")
+                        fut.set_exception(e)
                 
                 Clock.schedule_once(_resume_on_main_thread, 0)
                 
-                # Wait for result (efficient polling with shorter intervals)
-                import time
-                start_time = time.time()
-                timeout = 0.3  # Reduced timeout
-                while result[0] is None and (time.time() - start_time) < timeout:
-                    time.sleep(0.01)  # Shorter sleep interval for better responsiveness
-                
-                if result[0] is None or isinstance(result[0], dict):
+                # Block until the main thread resolves the future (raises on error or timeout)
+                try:
+                    return fut.result(timeout=0.3)
+                except Exception:
                     return "Could not resume timer"
-                
-                return result[0]
             else:
                 # Already on main thread
                 if not self.timer.is_running:
@@ -2087,50 +2207,41 @@ class Home(App):
                     return "Timer resumed"
                 else:
                     return "Timer is already running"
-        except Exception as e:
-            print(f"Error resuming timer: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error resuming timer")
             return "Could not resume timer"
     
     def reset_timer_voice(self) -> str:
         """Reset timer via voice command (thread-safe)."""
         try:
             # Timer access must happen on main thread
-            from threading import current_thread, main_thread
-            if current_thread() != main_thread():
+            if current_thread() is not _MAIN_THREAD:
                 # We're in a background thread, need to reset timer on main thread
-                result = [None]
+                fut = Future()
                 
                 def _reset_on_main_thread(dt):
                     try:
                         # Timer is stored as self.timer in the app
                         self.timer.reset(minutes=0)  # Reset to 00:00:00
-                        result[0] = 'success'
+                        fut.set_result('success')
                     except Exception as e:
-                        print(f"Error resetting timer: {e}")
-                        result[0] = {'error': str(e)}
+                        _log.exception("Error resetting timer")
+                        fut.set_exception(e)
                 
                 Clock.schedule_once(_reset_on_main_thread, 0)
                 
-                # Wait for result (efficient polling with shorter intervals)
-                import time
-                start_time = time.time()
-                timeout = 0.3  # Reduced timeout
-                while result[0] is None and (time.time() - start_time) < timeout:
-                    time.sleep(0.01)  # Shorter sleep interval for better responsiveness
-                
-                if result[0] is None or isinstance(result[0], dict):
+                # Block until the main thread resolves the future (raises on error or timeout)
+                try:
+                    fut.result(timeout=0.3)
+                except Exception:
                     return "Could not reset timer"
             else:
                 # Already on main thread
                 self.timer.reset(minutes=0)  # Reset to 00:00:00
             
             return "Timer reset to 00:00:00"
-        except Exception as e:
-            print(f"Error resetting timer: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error resetting timer")
             return "Could not reset timer"
     
     def _parse_date_hint(self, date_hint: str, title: str = "") -> 'date':
@@ -2139,7 +2250,7 @@ class Home(App):
         import re
         
         # Combine date_hint and title for parsing
-        text = f"{date_hint} {title}".lower()
+        text = ((date_hint or "") + " " + (title or "")).translate(_LOWER_TBL)
         today = date.today()
         
         # Handle "today"
@@ -2155,17 +2266,7 @@ class Home(App):
             return today + timedelta(days=7)
         
         # Handle day names (e.g., "next Monday", "this Friday")
-        day_names = {
-            'monday': 0, 'mon': 0,
-            'tuesday': 1, 'tue': 1, 'tues': 1,
-            'wednesday': 2, 'wed': 2,
-            'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
-            'friday': 4, 'fri': 4,
-            'saturday': 5, 'sat': 5,
-            'sunday': 6, 'sun': 6
-        }
-        
-        for day_name, day_num in day_names.items():
+        for day_name, day_num in _DAY_NAMES.items():
             if day_name in text:
                 current_day = today.weekday()
                 days_ahead = day_num - current_day
@@ -2192,22 +2293,7 @@ class Home(App):
                 pass
         
         # Try "Month Day" format (e.g., "December 5", "Dec 5")
-        month_names = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9, 'sept': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12
-        }
-        
-        for month_name, month_num in month_names.items():
+        for month_name, month_num in _MONTH_NAMES.items():
             if month_name in text:
                 # Find day number near the month name
                 match = re.search(rf'{month_name}\s*(\d{{1,2}})', text)
@@ -2229,251 +2315,182 @@ class Home(App):
         # Default to today if no date pattern matched
         return today
     
-    def add_event_voice(self, title: str, time_str: str = "", date_hint: str = "") -> str:
-        """Add event/appointment to calendar via voice command (thread-safe for SQLite)."""
+    def _parse_event_time(self, time_str: str, target_date) -> str | None:
+        """Combine a spoken time (e.g. "4pm", "14:00") with target_date into an ISO start_time.
+        Returns None when no time was given; unparseable times fall back to 12:00 PM."""
+        if not time_str:
+            return None
+        
+        start_time = None
         try:
-            if not title:
-                return "Please provide an event title"
-            
-            from datetime import datetime, date, timedelta
+            # Simple time parsing (e.g., "4pm", "2:30pm", "14:00", "5:00 p.m.")
+            time_str_lower = time_str.lower().strip()
             
-            # Parse date ONCE (before threading)
-            target_date = self._parse_date_hint(date_hint, title)
+            # Remove spaces and dots (e.g., "5:00 p.m." -> "5:00pm")
+            time_str_lower = time_str_lower.replace(' ', '').replace('.', '')
             
-            # Parse time if provided
-            start_time = None
-            if time_str:
-                try:
-                    # Simple time parsing (e.g., "4pm", "2:30pm", "14:00", "5:00 p.m.")
-                    time_str_lower = time_str.lower().strip()
-                    
-                    # Remove spaces and dots (e.g., "5:00 p.m." -> "5:00pm")
-                    time_str_lower = time_str_lower.replace(' ', '').replace('.', '')
-                    
-                    # Handle formats like "4pm", "4:30pm", "5:00pm"
-                    if 'pm' in time_str_lower or 'am' in time_str_lower:
-                        # Try parsing with different formats
-                        for fmt in ['%I%p', '%I:%M%p', '%I:%M:%S%p']:
-                            try:
-                                time_obj = datetime.strptime(time_str_lower, fmt).time()
-                                start_time = datetime.combine(target_date, time_obj).isoformat()
-                                break
-                            except:
-                                continue
-                    # Handle 24-hour format like "14:00" or "17:00"
-                    elif ':' in time_str_lower:
-                        try:
-                            # Try with seconds first, then without
-                            for fmt in ['%H:%M:%S', '%H:%M']:
-                                try:
-                                    time_obj = datetime.strptime(time_str_lower, fmt).time()
-                                    start_time = datetime.combine(target_date, time_obj).isoformat()
-                                    break
-                                except:
-                                    continue
-                        except:
-                            pass
-                    
-                    # If parsing still failed, use a default time (noon)
-                    if start_time is None:
-                        print(f"Warning: Could not parse time '{time_str}', using default 12:00 PM")
-                        time_obj = datetime.strptime("12:00pm", "%I:%M%p").time()
-                        start_time = datetime.combine(target_date, time_obj).isoformat()
-                except Exception as e:
-                    print(f"Error parsing time: {e}")
-                    # Use default time if parsing completely fails
+            # Handle formats like "4pm", "4:30pm", "5:00pm"
+            if 'pm' in time_str_lower or 'am' in time_str_lower:
+                # Try parsing with different formats
+                for fmt in _AMPM_FMTS:
                     try:
-                        time_obj = datetime.strptime("12:00pm", "%I:%M%p").time()
+                        time_obj = datetime.strptime(time_str_lower, fmt).time()
                         start_time = datetime.combine(target_date, time_obj).isoformat()
+                        break
                     except:
-                        pass
+                        continue
+            # Handle 24-hour format like "14:00" or "17:00"
+            elif ':' in time_str_lower:
+                try:
+                    # Try with seconds first, then without
+                    for fmt in _24H_FMTS:
+                        try:
+                            time_obj = datetime.strptime(time_str_lower, fmt).time()
+                            start_time = datetime.combine(target_date, time_obj).isoformat()
+                            break
+                        except:
+                            continue
+                except:
+                    pass
             
-            # Format the response message (before threading)
-            today = date.today()
-            if target_date == today:
+            # If parsing still failed, use a default time (noon)
+            if start_time is None:
+                print(f"Warning: Could not parse time '{time_str}', using default 12:00 PM")
+                time_obj = datetime.strptime("12:00pm", "%I:%M%p").time()
+                start_time = datetime.combine(target_date, time_obj).isoformat()
+        except Exception as e:
+            print(f"Error parsing time: {e}")
+            # Use default time if parsing completely fails
+            try:
+                time_obj = datetime.strptime("12:00pm", "%I:%M%p").time()
+                start_time = datetime.combine(target_date, time_obj).isoformat()
+            except:
+                pass
+        
+        return start_time
+    
+    def _detect_conflict(self, dt_obj, time_str, today, pending=None) -> str | None:
+        """Return a conflict message (with alternative time suggestions) if another
+        event already occupies dt_obj's slot, or None if the slot is free.
+        pending holds not-yet-inserted Tasks from the same batch that also claim slots."""
+        try:
+            event_date = dt_obj.date()
+            event_times = self.db.get_event_times_on_date(event_date)
+            if pending:
+                event_times = dict(event_times)
+                for pending_task in pending:
+                    pending_dt = datetime.fromisoformat(pending_task.start_time)
+                    if pending_dt.date() == event_date:
+                        event_times.setdefault((pending_dt.hour, pending_dt.minute), pending_task.title)
+            
+            # Early exit if no events exist or the slot is free
+            time_key = (dt_obj.hour, dt_obj.minute)
+            if time_key not in event_times:
+                return None
+            conflicting_title = event_times[time_key]
+            
+            if event_date == today:
                 date_display = "today"
-            elif target_date == today + timedelta(days=1):
+            elif event_date == today + timedelta(days=1):
                 date_display = "tomorrow"
             else:
-                date_display = target_date.strftime("%B %d")  # e.g., "December 5"
-            
-            response_msg = f"Added '{title}' on {date_display} at {time_str}" if time_str else f"Added '{title}' on {date_display}"
-            
-            # SQLite access must happen on main thread
-            from threading import current_thread, main_thread, Event
-            result_container = {'conflict_message': None, 'done': False}
-            result_event = Event()
+                date_display = event_date.strftime("%B %d")
+            
+            # Suggest alternative times (check pre-parsed times)
+            # Work in minutes-of-day so no timedelta/datetime objects are built per offset
+            base_minutes = dt_obj.hour * 60 + dt_obj.minute
+            suggestions = []
+            for offset_minutes in _TIME_OFFSETS:
+                alt_time_key = divmod((base_minutes + offset_minutes) % 1440, 60)
+                if alt_time_key not in event_times:
+                    # Format time in 12-hour format
+                    alt_hour, alt_minute = alt_time_key
+                    hour_12 = alt_hour % 12
+                    if hour_12 == 0:
+                        hour_12 = 12
+                    ampm = "am" if alt_hour < 12 else "pm"
+                    minute_str = f":{alt_minute:02d}" if alt_minute > 0 else ""
+                    suggestions.append(f"{hour_12}{minute_str}{ampm}")
+                    if len(suggestions) >= 3:  # Limit to 3 suggestions
+                        break
+            
+            # Build response message
+            if suggestions:
+                suggestions_str = ", ".join(suggestions)
+                return f"You already have '{conflicting_title}' at {time_str} on {date_display}. How about {suggestions_str} instead?"
+            return f"You already have '{conflicting_title}' at {time_str} on {date_display}. Please choose a different time."
+        except Exception as e:
+            print(f"Error checking for conflicts: {e}")
+            return None
+    
+    def _add_event_sync(self, title: str, time_str: str = "", date_hint: str = "", pending=None) -> tuple:
+        """Parse, conflict-check and create a voice event; must run on the main thread (SQLite).
+        When pending is a list, the new Task is appended to it for a later bulk insert instead of
+        being written immediately. Returns (added, message); UI refresh is left to the caller."""
+        target_date = self._parse_date_hint(date_hint, title)
+        start_time = self._parse_event_time(time_str, target_date)
+        if not start_time:
+            # Schedule items must have a start_time
+            return False, f"Please tell me what time '{title}' is"
+        
+        # Format the response message
+        today = date.today()
+        if target_date == today:
+            date_display = "today"
+        elif target_date == today + timedelta(days=1):
+            date_display = "tomorrow"
+        else:
+            date_display = target_date.strftime("%B %d")  # e.g., "December 5"
+        
+        conflict_message = self._detect_conflict(datetime.fromisoformat(start_time), time_str, today, pending)
+        if conflict_message:
+            return False, conflict_message
+        
+        event = Task(title=title, start_time=start_time)
+        if pending is None:
+            self.db.add_schedule_item(event)
+        else:
+            pending.append(event)
+        return True, f"Added '{title}' on {date_display} at {time_str}"
+    
+    def add_event_voice(self, title: str, time_str: str = "", date_hint: str = "") -> str:
+        """Add event/appointment to calendar via voice command (thread-safe for SQLite)."""
+        try:
+            if not title:
+                return "Please provide an event title"
             
-            def _check_and_add_on_main_thread(dt):
-                try:
-                    # Check for conflicts with existing events at the same date and time
-                    conflict_message = None
-                    if start_time:
-                            try:
-                                dt_obj = datetime.fromisoformat(start_time)
-                                event_date = dt_obj.date()
-                                existing_events = self.db.get_schedule_by_date_range(event_date, event_date)
-                                
-                                # Early exit if no events exist
-                                if not existing_events:
-                                    conflict_message = None
-                                else:
-                                    # Pre-calculate date display (used multiple times)
-                                    today_check = date.today()
-                                    if event_date == today_check:
-                                        date_display_check = "today"
-                                    elif event_date == today_check + timedelta(days=1):
-                                        date_display_check = "tomorrow"
-                                    else:
-                                        date_display_check = event_date.strftime("%B %d")
-                                    
-                                    # Pre-parse all event times for faster comparison
-                                    event_times = {}
-                                    for event in existing_events:
-                                        if event[2]:  # start_time
-                                            try:
-                                                existing_dt = datetime.fromisoformat(event[2])
-                                                if existing_dt.date() == event_date:
-                                                    time_key = (existing_dt.hour, existing_dt.minute)
-                                                    if time_key not in event_times:
-                                                        event_times[time_key] = event[1] if len(event) > 1 else "an event"
-                                            except:
-                                                pass
-                                    
-                                    # Check for conflict using pre-parsed times
-                                    time_key = (dt_obj.hour, dt_obj.minute)
-                                    if time_key in event_times:
-                                        conflicting_title = event_times[time_key]
-                                        
-                                        # Suggest alternative times (optimized - check pre-parsed times)
-                                        suggestions = []
-                                        for offset_minutes in [-60, -30, 30, 60]:
-                                            alt_time = dt_obj + timedelta(minutes=offset_minutes)
-                                            alt_time_key = (alt_time.hour, alt_time.minute)
-                                            if alt_time_key not in event_times:
-                                                # Format time in 12-hour format
-                                                hour_12 = alt_time.hour % 12
-                                                if hour_12 == 0:
-                                                    hour_12 = 12
-                                                ampm = "am" if alt_time.hour < 12 else "pm"
-                                                minute_str = f":{alt_time.minute:02d}" if alt_time.minute > 0 else ""
-                                                suggestions.append(f"{hour_12}{minute_str}{ampm}")
-                                                if len(suggestions) >= 3:  # Limit to 3 suggestions
-                                                    break
-                                        
-                                        # Build response message
-                                        if suggestions:
-                                            suggestions_str = ", ".join(suggestions)
-                                            conflict_message = f"You already have '{conflicting_title}' at {time_str} on {date_display_check}. How about {suggestions_str} instead?"
-                                        else:
-                                            conflict_message = f"You already have '{conflicting_title}' at {time_str} on {date_display_check}. Please choose a different time."
-                            except Exception as e:
-                                print(f"Error checking for conflicts: {e}")
-                    
-                    # Store result
-                    result_container['conflict_message'] = conflict_message
-                    
-                    # Only create event if no conflict
-                    if conflict_message is None:
-                        event = Task(title=title, start_time=start_time)
-                        self.db.add_schedule_item(event)
-                        # Refresh UI
-                        self.load_calendar_events()
-                        self.update_schedule_display()
-                    
-                    result_container['done'] = True
-                    result_event.set()
-                except Exception as e:
-                    print(f"Error adding event: {e}")
-                    result_container['done'] = True
+            if current_thread() is not _MAIN_THREAD:
+                # SQLite access must happen on main thread
+                result_container = {'message': None}
+                result_event = Event()
+                
+                def _add_on_main_thread(dt):
+                    added = False
+                    try:
+                        added, message = self._add_event_sync(title, time_str, date_hint)
+                        result_container['message'] = message
+                    except Exception:
+                        _log.exception("Error adding event")
+                    # Release the waiting caller before redrawing; the UI refreshes next frame
                     result_event.set()
-            
-            if current_thread() != main_thread():
-                # Schedule database and UI updates on main thread (non-blocking)
-                Clock.schedule_once(_check_and_add_on_main_thread, 0)
+                    if added:
+                        Clock.schedule_once(lambda dt: (self.load_calendar_events(), self.update_schedule_display()), 0)
+                
+                Clock.schedule_once(_add_on_main_thread, 0)
                 
                 # Wait for result (with shorter timeout to reduce lag)
                 result_event.wait(timeout=0.2)
-                
-                # Check if there was a conflict
-                if result_container['conflict_message']:
-                    return result_container['conflict_message']
-                # No conflict, return success message
-                return response_msg
-            else:
-                # Already on main thread - check conflicts directly (optimized)
-                if start_time:
-                    try:
-                        dt_obj = datetime.fromisoformat(start_time)
-                        event_date = dt_obj.date()
-                        existing_events = self.db.get_schedule_by_date_range(event_date, event_date)
-                        
-                        # Early exit if no events exist
-                        if existing_events:
-                            # Pre-calculate date display (used multiple times)
-                            today_check = date.today()
-                            if event_date == today_check:
-                                date_display_check = "today"
-                            elif event_date == today_check + timedelta(days=1):
-                                date_display_check = "tomorrow"
-                            else:
-                                date_display_check = event_date.strftime("%B %d")
-                            
-                            # Pre-parse all event times for faster comparison
-                            event_times = {}
-                            for event in existing_events:
-                                if event[2]:  # start_time
-                                    try:
-                                        existing_dt = datetime.fromisoformat(event[2])
-                                        if existing_dt.date() == event_date:
-                                            time_key = (existing_dt.hour, existing_dt.minute)
-                                            if time_key not in event_times:
-                                                event_times[time_key] = event[1] if len(event) > 1 else "an event"
-                                    except:
-                                        pass
-                            
-                            # Check for conflict using pre-parsed times
-                            time_key = (dt_obj.hour, dt_obj.minute)
-                            if time_key in event_times:
-                                conflicting_title = event_times[time_key]
-                                
-                                # Suggest alternative times (optimized - check pre-parsed times)
-                                suggestions = []
-                                for offset_minutes in [-60, -30, 30, 60]:
-                                    alt_time = dt_obj + timedelta(minutes=offset_minutes)
-                                    alt_time_key = (alt_time.hour, alt_time.minute)
-                                    if alt_time_key not in event_times:
-                                        # Format time in 12-hour format
-                                        hour_12 = alt_time.hour % 12
-                                        if hour_12 == 0:
-                                            hour_12 = 12
-                                        ampm = "am" if alt_time.hour < 12 else "pm"
-                                        minute_str = f":{alt_time.minute:02d}" if alt_time.minute > 0 else ""
-                                        suggestions.append(f"{hour_12}{minute_str}{ampm}")
-                                        if len(suggestions) >= 3:  # Limit to 3 suggestions
-                                            break
-                                
-                                # Build response message
-                                if suggestions:
-                                    suggestions_str = ", ".join(suggestions)
-                                    return f"You already have '{conflicting_title}' at {time_str} on {date_display_check}. How about {suggestions_str} instead?"
-                                else:
-                                    return f"You already have '{conflicting_title}' at {time_str} on {date_display_check}. Please choose a different time."
-                    except Exception as e:
-                        print(f"Error checking for conflicts: {e}")
-                
-                # No conflict, create event
-                event = Task(title=title, start_time=start_time)
-                self.db.add_schedule_item(event)
+                return result_container['message'] or f"Adding '{title}' to your calendar"
+            
+            # Already on main thread
+            added, message = self._add_event_sync(title, time_str, date_hint)
+            if added:
                 # Refresh UI
                 self.load_calendar_events()
                 self.update_schedule_display()
-            
-            return response_msg
-        except Exception as e:
-            print(f"Error adding event: {e}")
-            import traceback
-            traceback.print_exc()
+            return message
+        except Exception:
+            _log.exception("Error adding event")
             return "Could not add event"
     
     def add_task_voice(self, title: str, priority: str = "medium") -> str:
@@ -2494,19 +2511,15 @@ class Home(App):
                     self.db.add_task(task)
                     self.load_tasks()
                     self.update_schedule_display()
-                except Exception as e:
-                    print(f"Error adding task: {e}")
-                    import traceback
-                    traceback.print_exc()
+                except Exception:
+                    _log.exception("Error adding task")
             
             Clock.schedule_once(_add_on_main_thread, 0)
             
             priority_text = f" ({priority} priority)" if priority != "medium" else ""
             return f"Added task: {title}{priority_text}"
-        except Exception as e:
-            print(f"Error adding task: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error adding task")
             return "Could not add task"
     
     def add_multiple_tasks_voice(self, tasks_list: list) -> str:
@@ -2517,50 +2530,69 @@ class Home(App):
             
             def _add_on_main_thread(dt):
                 try:
+                    tasks = []
                     for task_data in tasks_list:
                         title = task_data.get('title', '').strip()
                         priority = task_data.get('priority', 'medium')
                         if title:
-                            task = Task(title=title, priority=priority)
-                            self.db.add_task(task)
+                            tasks.append(Task(title=title, priority=priority))
                     
+                    # One transaction for the whole batch instead of one commit per task
+                    self.db.add_tasks_bulk(tasks)
                     self.load_tasks()
                     self.update_schedule_display()
-                except Exception as e:
-                    print(f"Error adding multiple tasks: {e}")
+                except Exception:
+                    _log.exception("Error adding multiple tasks")
             
             Clock.schedule_once(_add_on_main_thread, 0)
             
             return f"Added {len(tasks_list)} tasks to your list!"
-        except Exception as e:
-            print(f"Error adding multiple tasks: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error adding multiple tasks")
             return "Could not add tasks"
     
     def add_multiple_events_voice(self, events_list: list) -> str:
-        """Add multiple events at once via voice command."""
+        """Add multiple events at once via voice command (one main-thread hop, one bulk insert)."""
         try:
             if not events_list:
                 return "No events provided"
             
-            added_count = 0
-            for event_data in events_list:
-                title = event_data.get('title', '').strip()
-                time_str = event_data.get('time', '')
-                date_hint = event_data.get('date', 'today')
-                
-                if title:
-                    # Use existing add_event_voice logic
-                    result = self.add_event_voice(title, time_str, date_hint)
-                    if "Added" in result:
-                        added_count += 1
+            result_container = {'added_count': None}
+            result_event = Event()
             
+            def _add_on_main_thread(dt):
+                new_events = []
+                try:
+                    # Earlier events in this batch count as conflicts for later ones
+                    for event_data in events_list:
+                        title = event_data.get('title', '').strip()
+                        if title:
+                            self._add_event_sync(title, event_data.get('time', ''), event_data.get('date', 'today'), new_events)
+                    
+                    if new_events:
+                        self.db.add_schedule_items_bulk(new_events)
+                    result_container['added_count'] = len(new_events)
+                except Exception:
+                    _log.exception("Error adding multiple events")
+                    result_container['added_count'] = 0
+                # Release the waiting caller before redrawing; the UI refreshes next frame
+                result_event.set()
+                if new_events and result_container['added_count']:
+                    Clock.schedule_once(lambda dt: (self.load_calendar_events(), self.update_schedule_display()), 0)
+            
+            if current_thread() is not _MAIN_THREAD:
+                Clock.schedule_once(_add_on_main_thread, 0)
+                result_event.wait(timeout=0.2)
+            else:
+                _add_on_main_thread(0)
+            
+            added_count = result_container['added_count']
+            if added_count is None:
+                # Main thread hasn't got to the insert yet; don't report a count we don't know
+                return f"Adding {len(events_list)} events to your calendar"
             return f"Added {added_count} events to your calendar!"
-        except Exception as e:
-            print(f"Error adding multiple events: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error adding multiple events")
             return "Could not add events"
     
     def suggest_task_priorities_voice(self) -> str:
@@ -2571,10 +2603,12 @@ class Home(App):
             
             task_count = len(self.tasks_list)
             
-            # Sort by priority
-            high_priority = [t for t in self.tasks_list if t.get('priority') == 'high']
-            medium_priority = [t for t in self.tasks_list if t.get('priority') == 'medium']
-            low_priority = [t for t in self.tasks_list if t.get('priority') == 'low']
+            # Bucket by priority in a single pass (unknown priorities count as medium)
+            buckets = {'high': [], 'medium': [], 'low': []}
+            for t in self.tasks_list:
+                buckets.get(t.get('priority'), buckets['medium']).append(t)
+            high_priority = buckets['high']
+            low_priority = buckets['low']
             
             # Generate advice based on task count and priorities
             if task_count <= 3:
@@ -2609,10 +2643,8 @@ class Home(App):
                 suggestion += "\n\nWant to start a 25-minute focus session?"
                 return suggestion
                 
-        except Exception as e:
-            print(f"Error suggesting priorities: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            _log.exception("Error suggesting priorities")
             return "Let me help you prioritize your tasks"
     
     def get_stats_voice(self, period="today") -> str:
@@ -2642,27 +2674,8 @@ class Home(App):
             return "Could not get stats"
     
     def get_streak_voice(self) -> str:
-        """Get current streak (uses cached data for speed)."""
-        try:
-            # Try to read from profile screen if available (cached)
-            try:
-                profile_screen = self.root.get_screen('profile')
-                current = profile_screen.ids.current_streak.text
-                best = profile_screen.ids.best_streak.text
-                return f"Your current streak is {current}! Best: {best}"
-            except:
-                # Fallback to cached value
-                streak = getattr(self, '_cached_streak', {'current': 0, 'best': 0})
-                current = streak['current']
-                best = streak['best']
-                
-                if current > 0:
-                    return f"Your current streak is {current} days! Best: {best} days"
-                else:
-                    return f"Start a focus session today to begin your streak! Best: {best} days"
-        except Exception as e:
-            print(f"Error getting streak: {e}")
-            return "Could not get streak"
+        """Get current streak (formatted whenever stats are refreshed)."""
+        return getattr(self, '_cached_streak_voice', "Could not get streak")
     
     def get_schedule_voice(self, date_hint: str = "today") -> str:
         """Get schedule for a specific date (uses cached calendar events for speed)."""
@@ -2681,16 +2694,8 @@ class Home(App):
             else:
                 date_display = target_date.strftime("%B %d")  # e.g., "December 5"
             
-            # Use cached calendar_events instead of querying database
-            target_events = []
-            for event in self.calendar_events:
-                if event.get('start_time'):
-                    try:
-                        dt = datetime.fromisoformat(event['start_time'])
-                        if dt.date() == target_date:
-                            target_events.append(event)
-                    except:
-                        pass
+            # Look up the cached per-day slice instead of querying the database
+            target_events = getattr(self, '_events_by_date_key', {}).get(target_date.isoformat(), [])
             
             if not target_events:
                 return f"No events scheduled for {date_display}"
@@ -2699,17 +2704,7 @@ class Home(App):
             event_list = []
             for event in target_events[:5]:  # Show up to 5 events
                 title = event.get('title', 'Event')
-                start_time = event.get('start_time')
-                
-                if start_time:
-                    try:
-                        dt = datetime.fromisoformat(start_time)
-                        time_str = dt.strftime("%I:%M %p").lstrip('0')
-                        event_list.append(f"• {time_str}: {title}")
-                    except:
-                        event_list.append(f"• {title}")
-                else:
-                    event_list.append(f"• {title}")
+                event_list.append(f"• {event['_time_str']}: {title}")
             
             if len(target_events) > 5:
                 event_list.append(f"... and {len(target_events) - 5} more")
@@ -2722,47 +2717,30 @@ class Home(App):
     def check_daily_notifications(self, dt=None):
         """Check and send daily goal reminders and streak alerts."""
         try:
-            from datetime import datetime, time
             now = datetime.now()
-            current_time = now.time()
-            
-            # Daily goal reminder at 9:00 AM (within 1 hour window)
-            morning_start = time(9, 0)
-            morning_end = time(10, 0)
-            if morning_start <= current_time <= morning_end:
-                # Check if we already sent today (simple check using last session date)
-                today_stats = self.stats_manager.get_daily_stats()
-                if today_stats['focus_minutes'] == 0:  # No sessions yet today
-                    self.notification_service.notify_daily_goal()
-            
-            # Streak alert at 8:00 PM (within 1 hour window)
-            evening_start = time(20, 0)
-            evening_end = time(21, 0)
-            if evening_start <= current_time <= evening_end:
-                today_stats = self.stats_manager.get_daily_stats()
-                if today_stats['focus_minutes'] == 0:  # No sessions yet today
-                    streak = self.stats_manager.get_focus_streak()
-                    current_streak = streak['current']
-                    if current_streak > 0:  # Only alert if there's a streak to maintain
-                        self.notification_service.notify_streak_alert(current_streak)
+            minutes = now.hour * 60 + now.minute
+            
+            # Daily goal reminder at 9:00 AM, streak alert at 8:00 PM (1 hour windows)
+            in_morning = _MORNING_START_MIN <= minutes <= _MORNING_END_MIN
+            in_evening = _EVENING_START_MIN <= minutes <= _EVENING_END_MIN
+            if not (in_morning or in_evening):
+                return
+            
+            today_stats = self.stats_manager.get_daily_stats()
+            if today_stats['focus_minutes'] != 0:  # Already focused today
+                return
+            
+            if in_morning:
+                self.notification_service.notify_daily_goal(now=now)
+            
+            if in_evening:
+                streak = self.stats_manager.get_focus_streak()
+                current_streak = streak['current']
+                if current_streak > 0:  # Only alert if there's a streak to maintain
+                    self.notification_service.notify_streak_alert(current_streak, now=now)
         except Exception as e:
             print(f"Error checking daily notifications: {e}")
     
-    def _get_first_session_date(self):
-        """Get the date of the first focus session."""
-        try:
-            cursor = self.stats_manager.conn.cursor()
-            cursor.execute("""
-                SELECT MIN(date) as first_date
-                FROM focus_sessions
-            """)
-            row = cursor.fetchone()
-            if row and row["first_date"]:
-                return datetime.strptime(row["first_date"], "%Y-%m-%d").date()
-        except Exception:
-            pass
-        return None
-    
     def prev_month(self):
         """Navigate to previous month."""
         self.calendar_manager.prev_month()
@@ -2779,153 +2757,6 @@ class Home(App):
         """Show events popup for a specific date."""
         self.calendar_manager.show_day_events(date_str)
     
-    def render_event_list(self, calendar_screen):
-        """Render the event list for the selected month."""
-        events_container = calendar_screen.ids.events_list_container
-        events_container.clear_widgets()
-        
-        if not self.calendar_events:
-            # Show empty state
-            empty_label = Label(
-                text="No events for this month.\nTap + to add an event!",
-                color=(0.8, 0.8, 1, 1),
-                font_size="15sp",
-                size_hint_y=None,
-                height=dp(80),
-                halign="center",
-                valign="middle"
-            )
-            empty_label.text_size = (None, None)
-            events_container.add_widget(empty_label)
-        else:
-            # Group events by date
-            events_by_date = {}
-            for event in self.calendar_events:
-                if event['start_time']:
-                    try:
-                        dt = datetime.fromisoformat(event['start_time'])
-                        event_date_str = dt.strftime("%Y-%m-%d")
-                        if event_date_str not in events_by_date:
-                            events_by_date[event_date_str] = []
-                        events_by_date[event_date_str].append(event)
-                    except:
-                        pass
-            
-            # Sort by date
-            sorted_dates = sorted(events_by_date.keys())
-            
-            for date_str in sorted_dates:
-                # Date header
-                dt = datetime.fromisoformat(date_str + " 00:00:00")
-                date_header = Label(
-                    text=dt.strftime("%B %d, %Y"),
-                    color=(0.3, 0.98, 0.6, 1),
-                    font_size="16sp",
-                    bold=True,
-                    size_hint_y=None,
-                    height=dp(35),
-                    halign="left",
-                    valign="middle"
-                )
-                date_header.text_size = (None, None)
-                events_container.add_widget(date_header)
-                
-                # Events for this date
-                for event in events_by_date[date_str]:
-                    dt = datetime.fromisoformat(event['start_time'])
-                    time_str = dt.strftime("%I:%M %p").lstrip('0')
-                    date_str_formatted = dt.strftime("%m/%d/%Y")
-                    
-                    event_item = Factory.EventListItem()
-                    event_item.event_id = event['id']
-                    event_item.event_title = event['title']
-                    event_item.event_time = time_str
-                    event_item.event_date = date_str_formatted
-                    event_item.event_source = event['source']
-                    events_container.add_widget(event_item)
-    
-    # Event management methods - delegated to EventManager
-    def open_create_event_popup(self):
-        self.event_manager.open_create_event_popup()
-    
-    def open_date_picker_for_event(self, event_popup):
-        self.event_manager.open_date_picker_for_event(event_popup)
-    
-    def date_picker_prev_month(self):
-        self.event_manager.date_picker_prev_month()
-    
-    def date_picker_next_month(self):
-        self.event_manager.date_picker_next_month()
-    
-    def render_date_picker_calendar(self):
-        self.event_manager.render_date_picker_calendar()
-    
-    def select_date_from_picker(self, date_str):
-        self.event_manager.select_date_from_picker(date_str)
-    
-    def confirm_date_selection(self):
-        self.event_manager.confirm_date_selection()
-    
-    def open_time_picker_for_event(self, event_popup):
-        self.event_manager.open_time_picker_for_event(event_popup)
-    
-    def render_time_picker(self):
-        self.event_manager.render_time_picker()
-    
-    def scroll_to_selected_time(self):
-        self.event_manager.scroll_to_selected_time()
-    
-    def select_hour(self, hour):
-        self.event_manager.select_hour(hour)
-    
-    def select_minute(self, minute):
-        self.event_manager.select_minute(minute)
-    
-    def select_ampm(self, ampm):
-        self.event_manager.select_ampm(ampm)
-    
-    def update_time_picker_highlighting(self):
-        self.event_manager.update_time_picker_highlighting()
-    
-    def update_time_display(self):
-        self.event_manager.update_time_display()
-    
-    def confirm_time_selection(self):
-        self.event_manager.confirm_time_selection()
-    
-    def on_recurring_toggle_changed(self, popup, is_active):
-        self.event_manager.on_recurring_toggle_changed(popup, is_active)
-    
-    def on_repeat_day_changed(self, day_num, state):
-        self.event_manager.on_repeat_day_changed(day_num, state)
-    
-    def create_event_from_popup(self, popup):
-        self.event_manager.create_event_from_popup(popup)
-    
-    def show_error_popup(self, message):
-        self.event_manager.show_error_popup(message)
-    
-    def open_date_picker_for_edit_event(self, event_popup):
-        self.event_manager.open_date_picker_for_edit_event(event_popup)
-    
-    def open_time_picker_for_edit_event(self, event_popup):
-        self.event_manager.open_time_picker_for_edit_event(event_popup)
-    
-    def update_event_from_popup(self, popup):
-        self.event_manager.update_event_from_popup(popup)
-    
-    def delete_event(self, event_id):
-        self.event_manager.delete_event(event_id)
-    
-    def open_event_actions_popup(self, event_id, event_title):
-        self.event_manager.open_event_actions_popup(event_id, event_title)
-    
-    def edit_event_from_day_popup(self, event_id):
-        self.event_manager.edit_event_from_day_popup(event_id)
-    
-    def delete_event_from_day_popup(self, event_id):
-        self.event_manager.delete_event_from_day_popup(event_id)
-    
     def _on_request_close(self, *args):
         """Handle window close; run cleanup and allow exit."""
         try:
@@ -2993,33 +2824,22 @@ class Home(App):
                     print(f"[CLEANUP] Error dismissing popup: {e}")
             
             # Close database connections (important!)
-            try:
-                if hasattr(self, 'db') and self.db and hasattr(self.db, 'conn'):
-                    self.db.conn.close()
-                    print("[CLEANUP] Closed main database")
-            except Exception as e:
-                print(f"[CLEANUP] Error closing main database: {e}")
-            
-            try:
-                if hasattr(self, 'stats_manager') and self.stats_manager and hasattr(self.stats_manager, 'conn'):
-                    self.stats_manager.conn.close()
-                    print("[CLEANUP] Closed stats database")
-            except Exception as e:
-                print(f"[CLEANUP] Error closing stats database: {e}")
-            
-            try:
-                if hasattr(self, 'profile_manager') and self.profile_manager and hasattr(self.profile_manager, 'conn'):
-                    self.profile_manager.conn.close()
-                    print("[CLEANUP] Closed profile database")
-            except Exception as e:
-                print(f"[CLEANUP] Error closing profile database: {e}")
-            
-            try:
-                if hasattr(self, 'notification_manager') and self.notification_manager and hasattr(self.notification_manager, 'conn'):
-                    self.notification_manager.conn.close()
-                    print("[CLEANUP] Closed notification database")
-            except Exception as e:
-                print(f"[CLEANUP] Error closing notification database: {e}")
+            # The main and notification databases own their connections and are closed here
+            for attr, label in (('db', 'main'), ('notification_manager', 'notification')):
+                conn = getattr(getattr(self, attr, None), 'conn', None)
+                if conn is not None:
+                    _safe_close(conn, label)
+            
+            # Stats and profile share db_pool's connection for their path; close each path once
+            pooled_paths = {getattr(getattr(self, 'stats_manager', None), 'db_name', None),
+                            getattr(getattr(self, 'profile_manager', None), 'db_path', None)}
+            pooled_paths.discard(None)
+            for db_path in pooled_paths:
+                try:
+                    close_connection(db_path)
+                    print(f"[CLEANUP] Closed shared database {db_path}")
+                except Exception as e:
+                    print(f"[CLEANUP] Error closing shared database {db_path}: {e}")
             
             print("[CLEANUP] Cleanup complete - app can close now")
         except Exception as e:
@@ -1,5 +1,49 @@
 import sqlite3
-from typing import Dict, Any
+from collections import namedtuple
+from typing import Optional
+
+
+def _hhmm_to_minutes(value: str) -> Optional[int]:
+    """Convert an 'HH:MM' string to minutes since midnight (None if malformed)."""
+    try:
+        hours, minutes = value.split(":")
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        return None
+
+
+# Boolean preference columns (one per notification type, plus sound and quiet hours)
+_PREF_FLAGS = (
+    "session_reminders",
+    "break_reminders",
+    "daily_goals",
+    "streak_alerts",
+    "task_deadlines",
+    "weekly_summary",
+    "achievements",
+    "notification_sound",
+    "quiet_hours_enabled",
+)
+
+# Immutable snapshot of the preferences row; quiet-hours bounds are also kept
+# pre-parsed to minutes since midnight
+Preferences = namedtuple(
+    "Preferences",
+    _PREF_FLAGS + ("quiet_hours_start", "quiet_hours_end", "quiet_start_min", "quiet_end_min")
+)
+
+# Column defaults, returned if the preferences row is somehow missing
+DEFAULT_PREFERENCES = Preferences(
+    True, True, True, True, True, False, True, True, False,
+    "22:00", "08:00", 22 * 60, 8 * 60
+)
+
+# Each updatable column gets its own fixed UPDATE statement so the SQL text is
+# never built from caller input
+_PREF_UPDATES = {
+    key: f"UPDATE notification_preferences SET {key} = ? WHERE id = 1"
+    for key in _PREF_FLAGS
+}
 
 
 class NotificationManager:
@@ -9,67 +53,62 @@ class NotificationManager:
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=2000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        # Preferences only change through update_* below, so cache the row between writes
+        self._prefs_cache = None
+        # Callbacks run after any preference write (e.g. NotificationService.refresh)
+        self._listeners = []
         self._ensure_table()
-        self._ensure_preferences_row()
     
     def _ensure_table(self):
-        """Create notification_preferences table if it doesn't exist."""
-        self.conn.execute("""
-            CREATE TABLE IF NOT EXISTS notification_preferences (
-                id INTEGER PRIMARY KEY,
-                session_reminders BOOLEAN DEFAULT 1,
-                break_reminders BOOLEAN DEFAULT 1,
-                daily_goals BOOLEAN DEFAULT 1,
-                streak_alerts BOOLEAN DEFAULT 1,
-                task_deadlines BOOLEAN DEFAULT 1,
-                weekly_summary BOOLEAN DEFAULT 0,
-                achievements BOOLEAN DEFAULT 1,
-                notification_sound BOOLEAN DEFAULT 1,
-                quiet_hours_enabled BOOLEAN DEFAULT 0,
-                quiet_hours_start TEXT DEFAULT '22:00',
-                quiet_hours_end TEXT DEFAULT '08:00'
-            )
-        """)
-        self.conn.commit()
-    
-    def _ensure_preferences_row(self):
-        """Ensure a default preferences row exists."""
-        cursor = self.conn.execute("SELECT COUNT(*) as count FROM notification_preferences")
-        count = cursor.fetchone()["count"]
-        if count == 0:
+        """Create notification_preferences table and its default row if missing.
+        Both statements share one transaction, so startup commits once."""
+        with self.conn:
             self.conn.execute("""
-                INSERT INTO notification_preferences (id) VALUES (1)
+                CREATE TABLE IF NOT EXISTS notification_preferences (
+                    id INTEGER PRIMARY KEY,
+                    session_reminders BOOLEAN DEFAULT 1,
+                    break_reminders BOOLEAN DEFAULT 1,
+                    daily_goals BOOLEAN DEFAULT 1,
+                    streak_alerts BOOLEAN DEFAULT 1,
+                    task_deadlines BOOLEAN DEFAULT 1,
+                    weekly_summary BOOLEAN DEFAULT 0,
+                    achievements BOOLEAN DEFAULT 1,
+                    notification_sound BOOLEAN DEFAULT 1,
+                    quiet_hours_enabled BOOLEAN DEFAULT 0,
+                    quiet_hours_start TEXT DEFAULT '22:00',
+                    quiet_hours_end TEXT DEFAULT '08:00'
+                )
             """)
-            self.conn.commit()
+            self.conn.execute("INSERT OR IGNORE INTO notification_preferences (id) VALUES (1)")
     
-    def get_preferences(self) -> Dict[str, Any]:
-        """Get all notification preferences."""
+    def get_preferences(self) -> Preferences:
+        """Get all notification preferences as a Preferences tuple (cached until the next update)."""
+        if self._prefs_cache is not None:
+            return self._prefs_cache
         cursor = self.conn.execute("SELECT * FROM notification_preferences WHERE id = 1")
         row = cursor.fetchone()
         if not row:
-            return {}
-        return {
-            "session_reminders": bool(row["session_reminders"]),
-            "break_reminders": bool(row["break_reminders"]),
-            "daily_goals": bool(row["daily_goals"]),
-            "streak_alerts": bool(row["streak_alerts"]),
-            "task_deadlines": bool(row["task_deadlines"]),
-            "weekly_summary": bool(row["weekly_summary"]),
-            "achievements": bool(row["achievements"]),
-            "notification_sound": bool(row["notification_sound"]),
-            "quiet_hours_enabled": bool(row["quiet_hours_enabled"]),
-            "quiet_hours_start": row["quiet_hours_start"],
-            "quiet_hours_end": row["quiet_hours_end"]
-        }
+            return DEFAULT_PREFERENCES
+        self._prefs_cache = Preferences(
+            *(bool(row[key]) for key in _PREF_FLAGS),
+            row["quiet_hours_start"],
+            row["quiet_hours_end"],
+            _hhmm_to_minutes(row["quiet_hours_start"]),
+            _hhmm_to_minutes(row["quiet_hours_end"])
+        )
+        return self._prefs_cache
     
     def update_preference(self, key: str, value: bool):
-        """Update a single notification preference."""
-        self.conn.execute(f"""
-            UPDATE notification_preferences
-            SET {key} = ?
-            WHERE id = 1
-        """, (1 if value else 0,))
+        """Update a single notification preference (KeyError for unknown keys)."""
+        sql = _PREF_UPDATES[key]
+        self.conn.execute(sql, (1 if value else 0,))
         self.conn.commit()
+        self._prefs_cache = None
+        self._notify_listeners()
     
     def update_quiet_hours(self, start_time: str, end_time: str):
         """Update quiet hours time range."""
@@ -79,11 +118,25 @@ class NotificationManager:
             WHERE id = 1
         """, (start_time, end_time))
         self.conn.commit()
+        self._prefs_cache = None
+        self._notify_listeners()
+    
+    def register_listener(self, callback):
+        """Register a no-argument callback invoked whenever preferences change."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def _notify_listeners(self):
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in preference listener: {e}")
     
     def close(self):
         """Close database connection."""
         self.conn.close()
 
 
-__all__ = ["NotificationManager"]
+__all__ = ["NotificationManager", "Preferences"]
 
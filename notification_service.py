@@ -1,5 +1,5 @@
 from plyer import notification
-from datetime import datetime, time
+from datetime import datetime
 from notification_manager import NotificationManager
 
 
@@ -9,32 +9,63 @@ class NotificationService:
     Supports Android, iOS, Windows, macOS, and Linux notifications.
     """
     
+    _STREAK_MILESTONES = {
+        7: 'One Week',
+        14: 'Two Weeks',
+        30: 'One Month',
+        60: 'Two Months',
+        90: 'Three Months',
+        180: 'Six Months',
+        365: 'One Year'
+    }
+    
+    _POMODORO_MILESTONES = {
+        10: 'First 10 Pomodoros',
+        25: '25 Pomodoros',
+        50: '50 Pomodoros',
+        100: '100 Pomodoros',
+        250: '250 Pomodoros',
+        500: '500 Pomodoros',
+        1000: '1000 Pomodoros'
+    }
+    
     def __init__(self, notification_manager):
         self.notification_manager = notification_manager
-    
-    def _is_quiet_hours(self):
-        """Check if current time is in quiet hours."""
+        # {notification_type: bool} and (enabled, start_min, end_min), rebuilt by refresh()
+        self._enabled = {}
+        self._quiet = (False, None, None)
+        self.refresh()
+        notification_manager.register_listener(self.refresh)
+    
+    def refresh(self):
+        """Re-read preferences into the enabled-type table and quiet-hours bounds."""
         try:
             prefs = self.notification_manager.get_preferences()
-            if not prefs.get('quiet_hours_enabled'):
-                return False
-            
-            now = datetime.now().time()
-            start_str = prefs.get('quiet_hours_start', '22:00')
-            end_str = prefs.get('quiet_hours_end', '08:00')
-            
-            start = datetime.strptime(start_str, '%H:%M').time()
-            end = datetime.strptime(end_str, '%H:%M').time()
-            
-            # Handle overnight quiet hours (e.g., 22:00 to 08:00)
-            if start > end:
-                return now >= start or now <= end
-            return start <= now <= end
         except Exception as e:
-            print(f"Error checking quiet hours: {e}")
+            print(f"Error loading notification preferences: {e}")
+            self._enabled = {}
+            self._quiet = (False, None, None)
+            return
+        self._enabled = {key: value for key, value in prefs._asdict().items()
+                         if isinstance(value, bool)}
+        self._quiet = (prefs.quiet_hours_enabled, prefs.quiet_start_min, prefs.quiet_end_min)
+    
+    def _is_quiet_hours(self, now=None):
+        """Check if the current (or given) time is in quiet hours."""
+        enabled, start, end = self._quiet
+        if not enabled or start is None or end is None:
             return False
+        
+        if now is None:
+            now = datetime.now()
+        now_minutes = now.hour * 60 + now.minute
+        
+        # Handle overnight quiet hours (e.g., 22:00 to 08:00)
+        if start > end:
+            return now_minutes >= start or now_minutes <= end
+        return start <= now_minutes <= end
     
-    def send_notification(self, title, message, notification_type):
+    def send_notification(self, title, message, notification_type, now=None):
         """
         Send a notification if enabled and not in quiet hours.
         
@@ -42,17 +73,14 @@ class NotificationService:
             title: Notification title
             message: Notification message
             notification_type: Type of notification (e.g., 'session_reminders')
+            now: Optional datetime the caller already has, reused for the quiet-hours check
         """
+        # Disabled types cost a single dict lookup
+        if not self._enabled.get(notification_type):
+            return
+        
         try:
-            prefs = self.notification_manager.get_preferences()
-            
-            # Check if this notification type is enabled
-            if not prefs.get(notification_type, False):
-                print(f"Notification disabled: {notification_type}")
-                return
-            
-            # Check quiet hours
-            if self._is_quiet_hours():
+            if self._is_quiet_hours(now):
                 print(f"Skipping notification (quiet hours): {title}")
                 return
             
@@ -113,7 +141,7 @@ class NotificationService:
     
     # ===== Daily Goal Notifications =====
     
-    def notify_daily_goal(self, goal_minutes=None):
+    def notify_daily_goal(self, goal_minutes=None, now=None):
         """Send daily goal reminder."""
         if goal_minutes:
             message = f'Your goal today: {goal_minutes} minutes of focused work!'
@@ -123,7 +151,8 @@ class NotificationService:
         self.send_notification(
             title='Daily Goal Reminder 🎯',
             message=message,
-            notification_type='daily_goals'
+            notification_type='daily_goals',
+            now=now
         )
     
     def notify_daily_goal_achieved(self, minutes_completed):
@@ -136,27 +165,18 @@ class NotificationService:
     
     # ===== Streak Notifications =====
     
-    def notify_streak_alert(self, current_streak):
+    def notify_streak_alert(self, current_streak, now=None):
         """Alert user to maintain their streak."""
         self.send_notification(
             title='Don\'t Break Your Streak! 🔥',
             message=f'You have a {current_streak} day streak. Start a session today!',
-            notification_type='streak_alerts'
+            notification_type='streak_alerts',
+            now=now
         )
     
     def notify_streak_milestone(self, streak_days):
         """Notify when user reaches a streak milestone."""
-        milestones = {
-            7: 'One Week',
-            14: 'Two Weeks',
-            30: 'One Month',
-            60: 'Two Months',
-            90: 'Three Months',
-            180: 'Six Months',
-            365: 'One Year'
-        }
-        
-        milestone_name = milestones.get(streak_days, f'{streak_days} Days')
+        milestone_name = self._STREAK_MILESTONES.get(streak_days, f'{streak_days} Days')
         
         self.send_notification(
             title=f'Streak Milestone: {milestone_name}! 🔥',
@@ -215,20 +235,11 @@ class NotificationService:
     
     def notify_pomodoro_milestone(self, total_pomodoros):
         """Notify when user reaches pomodoro milestones."""
-        milestones = {
-            10: 'First 10 Pomodoros',
-            25: '25 Pomodoros',
-            50: '50 Pomodoros',
-            100: '100 Pomodoros',
-            250: '250 Pomodoros',
-            500: '500 Pomodoros',
-            1000: '1000 Pomodoros'
-        }
-        
-        if total_pomodoros in milestones:
+        milestone_name = self._POMODORO_MILESTONES.get(total_pomodoros)
+        if milestone_name:
             self.send_notification(
                 title='Milestone Reached! 🎯',
-                message=f'Congratulations! You\'ve completed {milestones[total_pomodoros]}!',
+                message=f'Congratulations! You\'ve completed {milestone_name}!',
                 notification_type='achievements'
             )
 
@@ -1,8 +1,66 @@
 import sqlite3
-from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import secrets
 import hashlib
+import hmac
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from db_pool import get_connection, close_connection
+
+
+# PRF for new and upgraded hashes. SHA-512 at its 210k minimum costs roughly
+# twice the wall time of SHA-256 at 200k, so it is only kept for verifying
+# rows that were written with it.
+_PREFERRED_PRF = "sha256"
+
+# Iterations per PRF
+_PBKDF2_ITERATIONS = {
+    "sha256": 200_000,
+    "sha512": 210_000,
+}
+
+# HMAC pad translation tables for the pure-Python fallback
+_IPAD = bytes((x ^ 0x36) for x in range(256))
+_OPAD = bytes((x ^ 0x5C) for x in range(256))
+
+
+def _pbkdf2_hmac_python(prf: str, password: bytes, salt: bytes, iterations: int) -> bytes:
+    """PBKDF2-HMAC for Python builds without OpenSSL's pbkdf2_hmac.
+
+    The inner/outer pad states are hashed once and copied for every HMAC,
+    so each iteration only runs the two transforms over the previous U.
+    """
+    inner = hashlib.new(prf)
+    outer = hashlib.new(prf)
+    block_size = inner.block_size
+    if len(password) > block_size:
+        password = hashlib.new(prf, password).digest()
+    password = password.ljust(block_size, b"\x00")
+    inner.update(password.translate(_IPAD))
+    outer.update(password.translate(_OPAD))
+
+    def _hmac(msg: bytes) -> bytes:
+        icpy = inner.copy()
+        ocpy = outer.copy()
+        icpy.update(msg)
+        ocpy.update(icpy.digest())
+        return ocpy.digest()
+
+    # Derived key length equals the digest size, so only block 1 is needed
+    u = _hmac(salt + b"\x00\x00\x00\x01")
+    acc = int.from_bytes(u, "big")
+    for _ in range(iterations - 1):
+        u = _hmac(u)
+        acc ^= int.from_bytes(u, "big")
+    return acc.to_bytes(inner.digest_size, "big")
+
+
+# Single worker for PBKDF2 so logins never block the UI thread; OpenSSL's
+# pbkdf2_hmac releases the GIL while it runs
+_hash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pbkdf2")
+
+# OpenSSL's implementation already reuses the pad states internally
+_pbkdf2_hmac = getattr(hashlib, "pbkdf2_hmac", _pbkdf2_hmac_python)
 
 
 class ProfileManager:
@@ -17,8 +75,8 @@ class ProfileManager:
 
     def __init__(self, db_path: str = "tasks.db") -> None:
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
+        # Shared, pre-tuned connection (sqlite3.Row rows, autocommit)
+        self.conn = get_connection(self.db_path)
         self._ensure_table()
         self._ensure_profile_row()
 
@@ -34,8 +92,9 @@ class ProfileManager:
                 id INTEGER PRIMARY KEY,
                 username TEXT UNIQUE,
                 email TEXT UNIQUE,
-                password_hash TEXT,
-                password_salt TEXT,
+                password_hash BLOB,
+                password_salt BLOB,
+                password_prf TEXT DEFAULT 'sha256',
                 avatar_path TEXT,
                 timezone TEXT,
                 bio TEXT,
@@ -44,6 +103,14 @@ class ProfileManager:
             )
             """
         )
+        # Expression indexes so the case-insensitive login lookup is an index seek
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_username_lower ON user_profile(LOWER(username))")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_email_lower ON user_profile(LOWER(email))")
+        # Add the PRF column to existing databases; older rows were all SHA-256
+        try:
+            self.conn.execute("ALTER TABLE user_profile ADD COLUMN password_prf TEXT DEFAULT 'sha256'")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
         self.conn.commit()
 
     def _ensure_profile_row(self) -> None:
@@ -68,36 +135,38 @@ class ProfileManager:
             self.conn.commit()
 
     @staticmethod
-    def _hash_password(password: str, salt: Optional[str] = None) -> Dict[str, str]:
-        """Create a salted PBKDF2 hash for the supplied password."""
+    def _hash_password(password: str, salt: Optional[bytes] = None, prf: str = _PREFERRED_PRF) -> Dict[str, Any]:
+        """Create a salted PBKDF2 hash (raw bytes) for the supplied password."""
         if salt is None:
-            salt = secrets.token_hex(16)
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256",
+            salt = secrets.token_bytes(16)
+        hashed = _pbkdf2_hmac(
+            prf,
             password.encode("utf-8"),
-            bytes.fromhex(salt),
-            200_000,
+            salt,
+            _PBKDF2_ITERATIONS[prf],
         )
-        return {"salt": salt, "hash": hashed.hex()}
+        return {"salt": salt, "hash": hashed, "prf": prf}
 
     @staticmethod
-    def _verify_password(password: str, salt: str, stored_hash: str) -> bool:
-        candidate = hashlib.pbkdf2_hmac(
-            "sha256",
+    def _verify_password(password: str, salt: bytes, stored_hash: bytes, prf: str = "sha256") -> bool:
+        candidate = _pbkdf2_hmac(
+            prf,
             password.encode("utf-8"),
-            bytes.fromhex(salt),
-            200_000,
-        ).hex()
-        return secrets.compare_digest(candidate, stored_hash)
+            salt,
+            _PBKDF2_ITERATIONS[prf],
+        )
+        return hmac.compare_digest(candidate, stored_hash)
 
-    def _touch_updated_at(self) -> None:
+    def _store_password(self, salted: Dict[str, Any], row_id: int = 1, touch: bool = True) -> None:
+        """Write a salted hash; `touch` also bumps updated_at in the same statement."""
+        touch_sql = ", updated_at = CURRENT_TIMESTAMP" if touch else ""
         self.conn.execute(
-            """
+            f"""
             UPDATE user_profile
-            SET updated_at = ?
-            WHERE id = 1
+            SET password_hash = ?, password_salt = ?, password_prf = ?{touch_sql}
+            WHERE id = ?
             """,
-            (datetime.utcnow(),),
+            (sqlite3.Binary(salted["hash"]), sqlite3.Binary(salted["salt"]), salted["prf"], row_id),
         )
 
     # ------------------------------------------------------------------
@@ -153,6 +222,7 @@ class ProfileManager:
         if not updates:
             return
 
+        updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(1)  # WHERE id = 1
         query = f"""
             UPDATE user_profile
@@ -160,46 +230,91 @@ class ProfileManager:
             WHERE id = ?
         """
         self.conn.execute(query, params)
-        self._touch_updated_at()
         self.conn.commit()
 
     def set_password(self, password: str) -> None:
         """Hash and store a new password."""
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long.")
-        salted = self._hash_password(password)
-        self.conn.execute(
-            """
-            UPDATE user_profile
-            SET password_hash = ?, password_salt = ?
-            WHERE id = 1
-            """,
-            (salted["hash"], salted["salt"]),
-        )
-        self._touch_updated_at()
+        self._store_password(self._hash_password(password))
         self.conn.commit()
 
-    def authenticate(self, identifier: str, password: str) -> bool:
-        """
-        Validate login credentials. `identifier` can be either username or email.
-        Returns True if credentials match, False otherwise.
-        """
+    def _lookup_credentials(self, identifier: str):
+        """Fetch the stored credentials for a username or email (None if unusable)."""
         cursor = self.conn.execute(
             """
-            SELECT password_hash, password_salt
+            SELECT id, password_hash, password_salt, password_prf
             FROM user_profile
-            WHERE (LOWER(username) = LOWER(?)) OR (LOWER(email) = LOWER(?))
+            WHERE LOWER(username) = LOWER(?) OR LOWER(email) = LOWER(?)
             """,
             (identifier, identifier),
         )
         row = cursor.fetchone()
         if not row or not row["password_hash"] or not row["password_salt"]:
+            return None
+        return row["id"], row["password_hash"], row["password_salt"], row["password_prf"] or "sha256"
+
+    @classmethod
+    def _check_credentials(cls, credentials, password: str) -> Tuple[bool, Optional[Tuple[int, Dict[str, Any]]]]:
+        """
+        Verify a password against looked-up credentials (CPU only, no SQL).
+        Returns (ok, upgrade); `upgrade` is (row_id, salted) when the stored hash should be replaced.
+        """
+        row_id, stored_hash, salt, prf = credentials
+        # Rows written before the BLOB columns hold hex text
+        is_hex = isinstance(stored_hash, str)
+        if is_hex:
+            try:
+                salt = bytes.fromhex(salt)
+                stored_hash = bytes.fromhex(stored_hash)
+            except ValueError:
+                return False, None
+        if not cls._verify_password(password, salt, stored_hash, prf):
+            return False, None
+        # Re-hash as BLOBs with the preferred PRF so later logins use the faster path
+        if is_hex or prf != _PREFERRED_PRF:
+            return True, (row_id, cls._hash_password(password))
+        return True, None
+
+    def complete_authentication(self, result: Tuple[bool, Optional[Tuple[int, Dict[str, Any]]]]) -> bool:
+        """
+        Apply a _check_credentials result: store any upgraded hash and return whether login succeeded.
+        Call this on the thread that uses the connection, not on the hashing worker.
+        """
+        ok, upgrade = result
+        if upgrade is not None:
+            row_id, salted = upgrade
+            self._store_password(salted, row_id, touch=False)
+            self.conn.commit()
+        return ok
+
+    def authenticate(self, identifier: str, password: str) -> bool:
+        """
+        Validate login credentials. `identifier` can be either username or email.
+        Returns True if credentials match, False otherwise.
+        """
+        credentials = self._lookup_credentials(identifier)
+        if credentials is None:
             return False
-        return self._verify_password(password, row["password_salt"], row["password_hash"])
+        return self.complete_authentication(self._check_credentials(credentials, password))
+
+    def authenticate_async(self, identifier: str, password: str) -> Future:
+        """
+        Like authenticate(), but runs PBKDF2 on a worker thread.
+        The SQL lookup happens on the calling thread; the worker never touches the
+        connection. Returns a Future resolving to an (ok, upgrade) pair that must be
+        passed to complete_authentication() back on the calling thread.
+        """
+        credentials = self._lookup_credentials(identifier)
+        if credentials is None:
+            future = Future()
+            future.set_result((False, None))
+            return future
+        return _hash_executor.submit(self._check_credentials, credentials, password)
 
     def close(self) -> None:
-        """Close the SQLite connection."""
-        self.conn.close()
+        """Close the shared SQLite connection."""
+        close_connection(self.db_path)
 
 
 __all__ = ["ProfileManager"]
@@ -1,7 +1,9 @@
 import sqlite3
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 
+from db_pool import get_connection, close_connection
+
 
 class FocusStatsManager:
     """Manages focus statistics tracking using SQLite database.
@@ -12,11 +14,113 @@ class FocusStatsManager:
     - Historical data with relationships to tasks
     """
     
+    # Hot-path SQL kept as single constants so sqlite3's per-connection statement
+    # cache always hits the same prepared statement
+    INSERT_SESSION_QUERY = """
+        INSERT INTO focus_sessions (date, pomodoros, focus_minutes, task_id)
+        VALUES (?, 1, ?, ?)
+    """
+    
+    DAILY_STATS_QUERY = """
+        SELECT 
+            COUNT(*) as pomodoros,
+            COALESCE(SUM(focus_minutes), 0) as focus_minutes
+        FROM focus_sessions
+        WHERE date = ?
+    """
+    
+    # Day, all-time and duration aggregates in one scan of focus_sessions
+    SUMMARY_QUERY = """
+        SELECT 
+            COALESCE(SUM(CASE WHEN date = ? THEN 1 ELSE 0 END), 0) as today_pomodoros,
+            COALESCE(SUM(CASE WHEN date = ? THEN focus_minutes ELSE 0 END), 0) as today_minutes,
+            COUNT(*) as total_pomodoros,
+            COALESCE(SUM(focus_minutes), 0) as total_minutes,
+            AVG(focus_minutes) as avg_duration,
+            MIN(focus_minutes) as min_duration,
+            MAX(focus_minutes) as max_duration
+        FROM focus_sessions
+    """
+    
+    # Recursive date spine LEFT JOINed to the sessions, so days without
+    # sessions come back as zero rows from SQLite itself
+    HISTORY_RANGE_QUERY = """
+        WITH RECURSIVE spine(d) AS (
+            SELECT ?
+            UNION ALL
+            SELECT date(d, '+1 day') FROM spine WHERE d < ?
+        )
+        SELECT 
+            spine.d as date,
+            COUNT(fs.id) as pomodoros,
+            COALESCE(SUM(fs.focus_minutes), 0) as focus_minutes
+        FROM spine
+        LEFT JOIN focus_sessions fs ON fs.date = spine.d
+        GROUP BY spine.d
+        ORDER BY spine.d
+    """
+    
+    HOURLY_STATS_QUERY = """
+        SELECT 
+            hour_of_day as hour,
+            SUM(focus_minutes) as total_minutes
+        FROM focus_sessions
+        WHERE date >= ? AND hour_of_day IS NOT NULL
+        GROUP BY hour_of_day
+        ORDER BY hour_of_day
+    """
+    
+    # Fallback for SQLite builds without generated columns (< 3.31)
+    HOURLY_STATS_LEGACY_QUERY = """
+        SELECT 
+            CAST(strftime('%H', created_at) AS INTEGER) as hour,
+            SUM(focus_minutes) as total_minutes
+        FROM focus_sessions
+        WHERE date >= ? AND created_at IS NOT NULL
+        GROUP BY hour
+        ORDER BY hour
+    """
+    
+    FOCUS_STREAK_QUERY = """
+        WITH d AS (
+            SELECT DISTINCT date
+            FROM focus_sessions
+            WHERE julianday(date) IS NOT NULL
+        ),
+        g AS (
+            SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS grp
+            FROM d
+        ),
+        islands AS (
+            SELECT COUNT(*) AS cnt, MIN(date) AS first_date, MAX(date) AS last_date
+            FROM g
+            GROUP BY grp
+        )
+        SELECT
+            MAX(cnt) AS best,
+            COALESCE(MAX(CASE WHEN first_date <= :today AND last_date >= :today
+                         THEN CAST(julianday(:today) - julianday(first_date) AS INTEGER) + 1
+                         END), 0) AS current,
+            MAX(last_date) AS last_date
+        FROM islands
+    """
+    
     def __init__(self, db_name: str = "tasks.db"):
         self.db_name = db_name
-        self.conn = sqlite3.connect(db_name)
-        self.conn.row_factory = sqlite3.Row  # Access columns by name
+        # Shared, pre-tuned connection (sqlite3.Row rows, autocommit)
+        self.conn = get_connection(db_name)
+        # Reused by the hot-path queries instead of creating a cursor per call;
+        # it returns plain tuples, which unpack faster than sqlite3.Row lookups
+        self._cursor = self.conn.cursor()
+        self._cursor.row_factory = None
+        # Query results keyed by (query, date_key, write_version); any session
+        # insert bumps the version so stale entries are never returned
+        self._write_version = 0
+        self._result_cache = {}
         self._ensure_tables()
+        # Running totals for today, kept in memory and bumped on every insert
+        self._today_cache = None
+        self._load_today_cache()
     
     def _ensure_tables(self):
         """Ensure focus_sessions table exists."""
@@ -41,6 +145,27 @@ class FocusStatsManager:
             ON focus_sessions(date)
         """)
         
+        # Hour of day as a generated column so hourly stats group on an indexed
+        # value instead of formatting created_at per row. SQLite only allows
+        # VIRTUAL generated columns to be added with ALTER TABLE.
+        columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(focus_sessions)")}
+        if "hour_of_day" not in columns:
+            try:
+                cursor.execute("""
+                    ALTER TABLE focus_sessions ADD COLUMN hour_of_day INTEGER
+                    GENERATED ALWAYS AS (CAST(strftime('%H', created_at) AS INTEGER)) VIRTUAL
+                """)
+                columns.add("hour_of_day")
+            except sqlite3.OperationalError:
+                pass  # Generated columns unsupported; hourly stats use the legacy query
+        self._hourly_query = (self.HOURLY_STATS_QUERY if "hour_of_day" in columns
+                              else self.HOURLY_STATS_LEGACY_QUERY)
+        if "hour_of_day" in columns:
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_focus_date_hour
+                ON focus_sessions(date, hour_of_day)
+            """)
+        
         self.conn.commit()
     
     def add_completed_session(self, focus_minutes: int, task_id: int = None) -> None:
@@ -50,15 +175,58 @@ class FocusStatsManager:
             focus_minutes: Actual minutes spent focusing
             task_id: Optional ID of associated task
         """
-        today = str(date.today())
+        self.add_completed_sessions([(focus_minutes, task_id)])
+    
+    def add_completed_sessions(self, rows: list) -> None:
+        """Record several completed sessions for today in a single transaction.
         
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO focus_sessions (date, pomodoros, focus_minutes, task_id)
-            VALUES (?, 1, ?, ?)
-        """, (today, focus_minutes, task_id))
+        Args:
+            rows: List of (focus_minutes, task_id) tuples; task_id may be None
+        """
+        if not rows:
+            return
+        today = str(date.today())
         
-        self.conn.commit()
+        # The pooled connection is in autocommit mode, so open the transaction explicitly
+        self._cursor.execute("BEGIN")
+        try:
+            self._cursor.executemany(
+                self.INSERT_SESSION_QUERY,
+                [(today, focus_minutes, task_id) for focus_minutes, task_id in rows]
+            )
+            self._cursor.execute("COMMIT")
+        except Exception:
+            self._cursor.execute("ROLLBACK")
+            raise
+        self._bump_write_version()
+        
+        totals = self._today_cache
+        if totals is not None and str(totals["date"]) == today:
+            totals["pomodoros"] += len(rows)
+            totals["focus_minutes"] += sum(focus_minutes for focus_minutes, _ in rows)
+        else:
+            # Cache is from an earlier day; reloading picks up the rows just written
+            self._load_today_cache()
+    
+    def _load_today_cache(self, today: date = None) -> dict:
+        """(Re)load today's totals with one aggregate query."""
+        if today is None:
+            today = date.today()
+        pomodoros, focus_minutes = self._cursor.execute(self.DAILY_STATS_QUERY, (str(today),)).fetchone()
+        self._today_cache = {"date": today, "pomodoros": pomodoros, "focus_minutes": focus_minutes}
+        return self._today_cache
+    
+    def _today_totals(self) -> dict:
+        """Return today's running totals, reloading once the date has rolled over."""
+        today = date.today()
+        if self._today_cache is None or self._today_cache["date"] != today:
+            return self._load_today_cache(today)
+        return self._today_cache
+    
+    def _bump_write_version(self):
+        """Invalidate cached query results after a write."""
+        self._write_version += 1
+        self._result_cache.clear()
     
     def get_daily_stats(self, target_date: date = None) -> dict:
         """Get statistics for a specific date (default: today).
@@ -69,25 +237,57 @@ class FocusStatsManager:
         Returns:
             dict with 'pomodoros' and 'focus_minutes'
         """
-        if target_date is None:
-            target_date = date.today()
+        # Today's totals are served from memory without touching SQLite
+        if target_date is None or target_date == date.today():
+            totals = self._today_totals()
+            return {"pomodoros": totals["pomodoros"], "focus_minutes": totals["focus_minutes"]}
         
         date_str = str(target_date)
+        cache_key = ("daily", date_str, self._write_version)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
+        pomodoros, focus_minutes = self._cursor.execute(self.DAILY_STATS_QUERY, (date_str,)).fetchone()
+        result = {
+            "pomodoros": pomodoros,
+            "focus_minutes": focus_minutes
+        }
+        self._result_cache[cache_key] = result
+        return dict(result)
+    
+    def get_summary(self, target_date: date = None) -> dict:
+        """Get daily, all-time and session-duration stats from a single query.
         
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as pomodoros,
-                COALESCE(SUM(focus_minutes), 0) as focus_minutes
-            FROM focus_sessions
-            WHERE date = ?
-        """, (date_str,))
+        Args:
+            target_date: Date for the 'daily' part (default: today)
+            
+        Returns:
+            dict with 'daily' and 'all_time' ({'pomodoros', 'focus_minutes'})
+            and 'sessions' ({'avg', 'min', 'max', 'total'})
+        """
+        if target_date is None:
+            target_date = date.today()
         
-        row = cursor.fetchone()
-        return {
-            "pomodoros": row["pomodoros"],
-            "focus_minutes": row["focus_minutes"]
-        }
+        date_str = str(target_date)
+        cache_key = ("summary", date_str, self._write_version)
+        cached = self._result_cache.get(cache_key)
+        if cached is None:
+            (today_pomodoros, today_minutes, total_pomodoros, total_minutes,
+             avg, min_duration, max_duration) = self._cursor.execute(
+                self.SUMMARY_QUERY, (date_str, date_str)).fetchone()
+            cached = {
+                "daily": {"pomodoros": today_pomodoros, "focus_minutes": today_minutes},
+                "all_time": {"pomodoros": total_pomodoros, "focus_minutes": total_minutes},
+                "sessions": {
+                    'avg': int(avg) if avg else 0,
+                    'min': min_duration or 0,
+                    'max': max_duration or 0,
+                    'total': total_pomodoros
+                }
+            }
+            self._result_cache[cache_key] = cached
+        return {key: dict(value) for key, value in cached.items()}
     
     def get_all_time_stats(self) -> dict:
         """Get all-time cumulative statistics.
@@ -95,19 +295,7 @@ class FocusStatsManager:
         Returns:
             dict with 'pomodoros' and 'focus_minutes'
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as pomodoros,
-                COALESCE(SUM(focus_minutes), 0) as focus_minutes
-            FROM focus_sessions
-        """)
-        
-        row = cursor.fetchone()
-        return {
-            "pomodoros": row["pomodoros"],
-            "focus_minutes": row["focus_minutes"]
-        }
+        return self.get_summary()["all_time"]
     
     def get_history_range(self, days: int) -> dict:
         """Get stats for the last N days (including today).
@@ -118,40 +306,20 @@ class FocusStatsManager:
         Returns:
             Dictionary with dates as keys and stats as values, sorted by date
         """
+        if days <= 0:
+            return {}
         today = date.today()
         start_date = today - timedelta(days=days - 1)
         
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                date,
-                COUNT(*) as pomodoros,
-                COALESCE(SUM(focus_minutes), 0) as focus_minutes
-            FROM focus_sessions
-            WHERE date >= ? AND date <= ?
-            GROUP BY date
-            ORDER BY date
-        """, (str(start_date), str(today)))
-        
-        # Build result dictionary with all dates (fill missing dates with 0)
-        result = {}
-        for i in range(days):
-            target_date = start_date + timedelta(days=i)
-            date_str = str(target_date)
-            result[date_str] = {
-                "pomodoros": 0,
-                "focus_minutes": 0
-            }
+        rows = self._cursor.execute(self.HISTORY_RANGE_QUERY, (str(start_date), str(today))).fetchall()
         
-        # Fill in actual data
-        for row in cursor.fetchall():
-            date_str = row["date"]
-            result[date_str] = {
-                "pomodoros": row["pomodoros"],
-                "focus_minutes": row["focus_minutes"]
+        return {
+            day: {
+                "pomodoros": pomodoros,
+                "focus_minutes": focus_minutes
             }
-        
-        return result
+            for day, pomodoros, focus_minutes in rows
+        }
     
     def get_stats_by_date_range(self, start_date: date, end_date: date) -> list:
         """Get detailed session data for a date range.
@@ -194,27 +362,16 @@ class FocusStatsManager:
         Returns:
             Dictionary with hour (0-23) as key and total minutes as value
         """
-        cursor = self.conn.cursor()
         start_date = date.today() - timedelta(days=days)
-        
-        cursor.execute("""
-            SELECT 
-                CAST(strftime('%H', created_at) AS INTEGER) as hour,
-                SUM(focus_minutes) as total_minutes
-            FROM focus_sessions
-            WHERE date >= ? AND created_at IS NOT NULL
-            GROUP BY hour
-            ORDER BY hour
-        """, (str(start_date),))
+        rows = self._cursor.execute(self._hourly_query, (str(start_date),)).fetchall()
         
         # Initialize all hours to 0
         hourly_data = {i: 0 for i in range(24)}
         
         # Fill in actual data
-        for row in cursor.fetchall():
-            hour = row["hour"]
+        for hour, total_minutes in rows:
             if 0 <= hour <= 23:
-                hourly_data[hour] = row["total_minutes"]
+                hourly_data[hour] = total_minutes
         
         return hourly_data
     
@@ -260,25 +417,7 @@ class FocusStatsManager:
         Returns:
             Dictionary with 'avg', 'min', 'max', 'total' keys
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                AVG(focus_minutes) as avg_duration,
-                MIN(focus_minutes) as min_duration,
-                MAX(focus_minutes) as max_duration,
-                COUNT(*) as total_sessions
-            FROM focus_sessions
-        """)
-        
-        row = cursor.fetchone()
-        avg = row["avg_duration"]
-        
-        return {
-            'avg': int(avg) if avg else 0,
-            'min': row["min_duration"] or 0,
-            'max': row["max_duration"] or 0,
-            'total': row["total_sessions"] or 0
-        }
+        return self.get_summary()["sessions"]
     
     def get_focus_streak(self) -> dict:
         """Get current and best focus streak (consecutive days with sessions).
@@ -286,57 +425,38 @@ class FocusStatsManager:
         Returns:
             Dictionary with 'current', 'best', 'last_date' keys
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT date
-            FROM focus_sessions
-            ORDER BY date DESC
-        """)
-        
-        dates = []
-        for row in cursor.fetchall():
-            try:
-                dates.append(datetime.strptime(row["date"], "%Y-%m-%d").date())
-            except:
-                continue
-        
-        if not dates:
-            return {'current': 0, 'best': 0, 'last_date': None}
-        
-        # Calculate current streak
+        # Current streak depends on today's date, so it is part of the key
         today = date.today()
-        current_streak = 0
-        check_date = today
-        
-        for d in dates:
-            if d == check_date:
-                current_streak += 1
-                check_date = d - timedelta(days=1)
-            elif d < check_date:
-                break
-        
-        # Calculate best streak
-        best_streak = 1 if dates else 0
-        current_run = 1
-        for i in range(1, len(dates)):
-            if (dates[i-1] - dates[i]).days == 1:
-                current_run += 1
-                best_streak = max(best_streak, current_run)
-            else:
-                current_run = 1
-        
-        return {
-            'current': current_streak,
-            'best': best_streak,
-            'last_date': dates[0] if dates else None
-        }
+        cache_key = ("streak", today, self._write_version)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
+        # Gaps-and-islands: consecutive days share the same julianday - row_number,
+        # so each group is one streak. The current streak is the island that
+        # contains today, counted from its first day up to today.
+        best, current, last_date = self._cursor.execute(
+            self.FOCUS_STREAK_QUERY, {"today": str(today)}).fetchone()
+        
+        if best is None:
+            result = {'current': 0, 'best': 0, 'last_date': None}
+        else:
+            result = {
+                'current': current,
+                'best': best,
+                'last_date': date.fromisoformat(last_date)
+            }
+        self._result_cache[cache_key] = result
+        return dict(result)
     
     def reset_all_time_stats(self) -> None:
         """Reset all statistics (use with caution)."""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM focus_sessions")
         self.conn.commit()
+        self._bump_write_version()
+        self._today_cache = None
     
     def close(self):
-        """Close database connection."""
-        self.conn.close()
+        """Close the shared database connection."""
+        close_connection(self.db_name)
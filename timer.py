@@ -1,3 +1,6 @@
+import weakref
+from time import monotonic
+
 from kivy.clock import Clock
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
@@ -20,13 +23,12 @@ class PomodoroTimer:
         self._session_start_seconds = None  # Track session start for focus time calculation
         self._session_start_time = None  # Track actual start time for elapsed calculation
         self._start_notification_sent = False  # Track if start notification was sent
+        self._label_ref = None  # Weak reference to the timer label, found once
+        self._format = "{:02d}.{:02d}.{:02d}".format  # Pre-bound hh.mm.ss formatter
 
     # ---- Internal helpers ----
-    def _update_label(self) -> None:
-        total = max(self.remaining_seconds, 0)
-        hours, rem = divmod(total, 3600)
-        minutes, seconds = divmod(rem, 60)
-        # Try to find the timer label in the home screen
+    def _find_label(self):
+        """Walk the widget tree for the label with id 'timer_label'."""
         label = None
         try:
             root = getattr(self.app, 'root', None)
@@ -46,8 +48,21 @@ class PomodoroTimer:
                     label = getattr(root.ids, 'timer_label', None)
         except Exception:
             pass
-        if label:
-            label.text = f"{int(hours):02d}.{int(minutes):02d}.{int(seconds):02d}"
+        return label
+
+    def _update_label(self) -> None:
+        # remaining_seconds is always an int, so divmod already yields ints
+        total = self.remaining_seconds if self.remaining_seconds > 0 else 0
+        hours, rem = divmod(total, 3600)
+        minutes, seconds = divmod(rem, 60)
+        # Reuse the cached label; only walk the widget tree if it is gone
+        label = self._label_ref() if self._label_ref is not None else None
+        if label is None:
+            label = self._find_label()
+            if label is None:
+                return
+            self._label_ref = weakref.ref(label)
+        label.text = self._format(hours, minutes, seconds)
 
     def _tick(self, _dt: float) -> None:
         if not self.is_running:
@@ -102,8 +117,7 @@ class PomodoroTimer:
         # Always track the actual system time when starting (works for both countdown and count-up)
         # This is the primary method for tracking elapsed time
         if self._session_start_time is None:
-            from time import time
-            self._session_start_time = time()
+            self._session_start_time = monotonic()
             
             # Send start notification (only once per session)
             if not self._start_notification_sent and hasattr(self.app, 'notification_service'):
@@ -145,8 +159,7 @@ class PomodoroTimer:
         """
         # Primary method: Use actual time tracking (most accurate, works for both countdown and count-up)
         if self._session_start_time is not None:
-            from time import time
-            elapsed_seconds = time() - self._session_start_time
+            elapsed_seconds = monotonic() - self._session_start_time
             # Return elapsed time if timer was started (regardless of current running state)
             return max(0, int(elapsed_seconds // 60))
         
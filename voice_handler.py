@@ -4,11 +4,170 @@ Handles speech recognition (speech-to-text) and text-to-speech
 with improved error handling and customization options
 """
 
-import speech_recognition as sr
-import pyttsx3
-from threading import Thread
+import io
+import json
+import logging
+import os
+import queue
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from threading import Thread, Event, Lock, current_thread
+from time import monotonic
 from typing import Callable, Optional
-import time
+
+_log = logging.getLogger(__name__)
+
+# speech_recognition pulls in PyAudio/PortAudio, so it's imported on first use
+sr = None
+np = None  # numpy, likewise only needed once audio is captured
+
+
+def _import_speech_recognition():
+    """Import speech_recognition into the module global `sr` once."""
+    global sr
+    if sr is None:
+        import speech_recognition
+        sr = speech_recognition
+    return sr
+
+
+def _import_numpy():
+    """Import numpy into the module global `np` once."""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+# Capture at 16 kHz mono int16: what Vosk expects, and a third of the data a
+# 48 kHz default device would send to Google
+_MIC_SAMPLE_RATE = 16000
+_MIC_CHUNK = 1024
+
+
+def _new_microphone(device_index: Optional[int] = None):
+    """Create a 16 kHz Microphone, or one at the device's native rate if it can't do 16 kHz."""
+    sr = _import_speech_recognition()
+    pyaudio = sr.Microphone.get_pyaudio()
+    audio = pyaudio.PyAudio()
+    try:
+        index = device_index
+        if index is None:
+            index = audio.get_default_input_device_info()["index"]
+        audio.is_format_supported(
+            _MIC_SAMPLE_RATE, input_device=index,
+            input_channels=1, input_format=pyaudio.paInt16
+        )
+        rate = _MIC_SAMPLE_RATE
+    except ValueError:
+        rate = None  # Device default; phrases are resampled before recognition
+    finally:
+        audio.terminate()
+    return sr.Microphone(device_index=device_index, sample_rate=rate, chunk_size=_MIC_CHUNK)
+
+
+# Google Web Speech requests share one keep-alive session so repeat
+# recognitions skip the TCP/TLS handshake
+_GOOGLE_STT_ENDPOINT = "https://www.google.com/speech-api/v2/recognize"
+_http_session = None
+
+
+def _google_session():
+    """Return the shared requests.Session for Google speech requests."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        _http_session = session
+    return _http_session
+
+
+_soundfile = None  # soundfile module, False if unavailable; checked on first upload
+
+
+def _encode_flac(audio, builder) -> bytes:
+    """FLAC-encode a phrase with libsndfile, falling back to speech_recognition's encoder."""
+    global _soundfile
+    if _soundfile is None:
+        try:
+            import soundfile
+            _soundfile = soundfile
+        except (ImportError, OSError):  # OSError: libsndfile itself is missing
+            _soundfile = False
+    if not _soundfile or audio.sample_rate < 8000:
+        return builder.build_data(audio)
+    
+    np = _import_numpy()
+    pcm = np.frombuffer(audio.get_raw_data(convert_width=2), dtype=np.int16)
+    buf = io.BytesIO()
+    _soundfile.write(buf, pcm, audio.sample_rate, format="FLAC", subtype="PCM_16")
+    return buf.getvalue()
+
+# Queued utterance; `generation` lets stop_speaking() cancel jobs already queued
+_SpeechJob = namedtuple("_SpeechJob", ["text", "generation", "done", "interrupt"])
+_SHUTDOWN = object()
+_SPEAK_COALESCE_SECONDS = 0.05  # Non-interrupting speak() calls this close together share one utterance
+
+# Energy VAD used in place of Recognizer.listen()'s 0.8 s pause_threshold
+_VAD_FRAME_SECONDS = 0.02    # 20 ms analysis frames
+_VAD_SILENCE_SECONDS = 0.3   # Trailing silence that ends a phrase
+_VAD_PRE_ROLL_SECONDS = 0.3  # Audio kept from before the first voiced frame
+_VAD_FRICATIVE_ZCR = 0.25    # Zero-crossing rate that marks quiet "s"/"f" sounds as speech
+
+# Noise-floor energy doesn't need full bandwidth; calibrate on ~8 kHz samples
+_CALIBRATION_RATE = 8000
+
+
+def _frame_stats_python(x):
+    """Return (sum of squares, zero crossings) of an int16 frame in one pass (numba kernel source)."""
+    energy = 0.0
+    crossings = 0
+    prev_positive = True
+    for i in range(x.size):
+        v = float(x[i])
+        energy += v * v
+        positive = v >= 0.0
+        if i and positive != prev_positive:
+            crossings += 1
+        prev_positive = positive
+    return energy, crossings
+
+
+def _frame_stats_numpy(x):
+    """Vectorised _frame_stats() for when numba isn't installed."""
+    x = x.astype(np.float32)
+    negative = x < 0.0
+    # dot() sums the squares without materialising an x**2 array
+    return float(np.dot(x, x)), int(np.count_nonzero(negative[1:] != negative[:-1]))
+
+
+_frame_stats = None  # Chosen (and compiled) on first use by _get_frame_stats()
+
+
+def _get_frame_stats():
+    """
+    Return the VAD frame kernel, JIT-compiling it with numba on first use.
+    
+    Runs on the first listen's worker thread, so numba's import and compile
+    stay off app start-up. numba is optional; without it the NumPy version is used.
+    """
+    global _frame_stats
+    if _frame_stats is None:
+        np = _import_numpy()
+        kernel = _frame_stats_numpy
+        try:
+            from numba import njit
+            kernel = njit(cache=True, fastmath=True)(_frame_stats_python)
+            kernel(np.zeros(320, dtype=np.int16))  # Compile now, not on the first live frame
+        except Exception as e:  # ImportError, or a numba build that can't compile here
+            _log.debug("numba unavailable, using NumPy VAD kernel: %s", e)
+            kernel = _frame_stats_numpy
+        _frame_stats = kernel
+    return _frame_stats
 
 
 class VoiceHandler:
@@ -16,48 +175,457 @@ class VoiceHandler:
     Handles speech recognition and text-to-speech with enhanced features.
     """
     
-    def __init__(self, voice_rate: int = 160, voice_volume: float = 0.9):
+    def __init__(
+        self,
+        voice_rate: int = 160,
+        voice_volume: float = 0.9,
+        vosk_model_path: str = "model-small-en",
+        recalibrate_every: Optional[float] = None
+    ):
         """
         Initialize voice handler with recognizer and TTS engine.
         
         Args:
             voice_rate: Speech rate in words per minute (default: 160)
             voice_volume: Volume level 0.0 to 1.0 (default: 0.9)
+            vosk_model_path: Directory of a Vosk model for offline streaming
+                recognition; Google Web Speech is used if it's missing
+            recalibrate_every: Seconds before the ambient-noise calibration
+                is redone automatically (default: None, calibrate once)
         """
-        self.recognizer = sr.Recognizer()
+        self._recognizer = None  # Built with speech_recognition on first use
+        self._recognizers_by_lang = {}  # language -> bound recognize_google partial
         self.tts_engine = None
+        self._voices_cache: Optional[list] = None  # Filled when the engine starts
         self.is_listening = False
         self.is_speaking = False
+        # Held while the cached microphones and capture buffer are in use:
+        # for the whole of one listen() job, or a mic test/calibration/switch
+        self._listen_lock = Lock()
+        
+        # Microphone and its ambient-noise calibration are reused across listen() calls
+        self._mic_by_index = {}  # device index (None = default) -> sr.Microphone
+        self._mic = None  # Currently selected microphone
+        self._calibrated = False
+        self._calibrated_at = 0.0
+        self.recalibrate_every = recalibrate_every
+        self._ring = None  # int16 capture buffer, allocated and grown on demand
+        
+        # Listen jobs run on a small fixed pool instead of a new thread per call
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="voice")
         
-        # Recognizer settings for better accuracy
-        self.recognizer.energy_threshold = 4000  # Adjust based on environment
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.dynamic_energy_adjustment_damping = 0.15
-        self.recognizer.dynamic_energy_ratio = 1.5
-        self.recognizer.pause_threshold = 0.8  # Seconds of silence before phrase is considered complete
+        # Local streaming recognizer, loaded on first listen()
+        self._vosk_model_path = vosk_model_path
+        self._vosk_model = None
+        self._vosk_checked = False
+        
+        # The TTS engine lives on one dedicated thread for its whole lifetime;
+        # everything else talks to it through this queue. The thread (and the
+        # pyttsx3 import) starts on first use.
+        self._tts_q = queue.Queue()
+        self._tts_generation = 0
+        self._tts_state_lock = Lock()  # Guards is_speaking and _tts_generation
+        self._tts_ready = Event()
+        self._tts_thread = Thread(
+            target=self._tts_loop, args=(voice_rate, voice_volume),
+            name="voice-tts", daemon=True
+        )
+    
+    @property
+    def recognizer(self):
+        """The shared sr.Recognizer, created (and speech_recognition imported) on first use."""
+        if self._recognizer is None:
+            recognizer = _import_speech_recognition().Recognizer()
+            
+            # Recognizer settings for better accuracy
+            recognizer.energy_threshold = 4000  # Adjust based on environment
+            recognizer.dynamic_energy_threshold = True
+            recognizer.dynamic_energy_adjustment_damping = 0.15
+            recognizer.dynamic_energy_ratio = 1.5
+            recognizer.pause_threshold = 0.8  # Seconds of silence before phrase is considered complete
+            self._recognizer = recognizer
+        return self._recognizer
+    
+    def _get_recognize(self, language: str) -> Callable:
+        """Return a Google recognition call with its request builder fixed for `language`."""
+        recognize = self._recognizers_by_lang.get(language)
+        if recognize is None:
+            from speech_recognition.recognizers.google import create_request_builder
+            builder = create_request_builder(endpoint=_GOOGLE_STT_ENDPOINT, language=language)
+            recognize = partial(self._recognize_google, builder)
+            self._recognizers_by_lang[language] = recognize
+        return recognize
+    
+    def _recognize_google(self, builder, audio) -> str:
+        """
+        Same request and parsing as Recognizer.recognize_google(), but sent
+        over the shared keep-alive session instead of a fresh urlopen().
+        """
+        import requests
+        from speech_recognition.recognizers.google import OutputParser
         
-        # Initialize TTS engine
         try:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', voice_rate)
-            self.tts_engine.setProperty('volume', voice_volume)
+            response = _google_session().post(
+                builder.build_url(),
+                data=_encode_flac(audio, builder),
+                headers=builder.build_headers(audio),
+                timeout=self.recognizer.operation_timeout
+            )
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            raise sr.RequestError(f"recognition request failed: {e.response.reason}")
+        except requests.RequestException as e:
+            raise sr.RequestError(f"recognition connection failed: {e}")
+        
+        parser = OutputParser(show_all=False, with_confidence=False)
+        return parser.parse(response.content.decode("utf-8"))
+    
+    def _start_tts(self):
+        """Start the TTS thread if it hasn't been started yet."""
+        if self._tts_thread.ident is None:
+            with self._tts_state_lock:
+                if self._tts_thread.ident is None:
+                    self._tts_thread.start()
+    
+    def _tts_available(self) -> bool:
+        """Start the TTS thread if needed and wait for the engine to come up."""
+        self._start_tts()
+        self._tts_ready.wait(timeout=5)
+        return self.tts_engine is not None
+    
+    def _tts_loop(self, voice_rate: int, voice_volume: float):
+        """Own the pyttsx3 engine and service queued jobs until shutdown."""
+        # pyttsx3.init() must run on the thread that drives the engine (SAPI5 COM)
+        engine = None
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty('rate', voice_rate)
+            engine.setProperty('volume', voice_volume)
             
             # Try to set a pleasant voice
-            voices = self.tts_engine.getProperty('voices')
+            voices = engine.getProperty('voices')
+            self._voices_cache = [
+                {
+                    'index': i,
+                    'id': voice.id,
+                    'name': voice.name,
+                    'languages': voice.languages if hasattr(voice, 'languages') else []
+                }
+                for i, voice in enumerate(voices)
+            ]
             if len(voices) > 1:
                 # Prefer female voice (usually index 1) if available
-                self.tts_engine.setProperty('voice', voices[1].id)
+                engine.setProperty('voice', voices[1].id)
             
-            print(f"✓ TTS engine initialized (rate: {voice_rate}, volume: {voice_volume})")
+            self.tts_engine = engine
+            _log.debug("TTS engine initialized (rate: %s, volume: %s)", voice_rate, voice_volume)
         except Exception as e:
-            print(f"✗ TTS initialization error: {e}")
+            _log.error("TTS initialization error: %s", e)
+            engine = None
+        finally:
+            self._tts_ready.set()
+        
+        # Without an engine the loop keeps running only to release callers
+        # waiting on queued jobs, until shutdown
+        pending = None
+        while True:
+            job = pending if pending is not None else self._tts_q.get()
+            pending = None
+            if job is _SHUTDOWN:
+                break
+            if engine is None:
+                self._fail_tts_job(job)
+            elif isinstance(job, _SpeechJob):
+                jobs, pending = self._collect_speech(job)
+                self._say(engine, jobs)
+            else:
+                fn, future = job
+                try:
+                    future.set_result(fn(engine))
+                except Exception as e:
+                    future.set_exception(e)
+        
+        # Release anything queued behind the shutdown sentinel
+        while True:
+            try:
+                self._fail_tts_job(self._tts_q.get_nowait())
+            except queue.Empty:
+                break
+    
+    @staticmethod
+    def _fail_tts_job(job):
+        """Complete a job that will never run so nobody waits on it forever."""
+        if isinstance(job, _SpeechJob):
+            job.done.set()
+        elif job is not _SHUTDOWN:
+            job[1].set_exception(RuntimeError("TTS engine not available"))
+    
+    def _collect_speech(self, first: _SpeechJob):
+        """
+        Gather speech jobs queued within _SPEAK_COALESCE_SECONDS of `first`.
+        
+        Returns (jobs, pending) where pending is the job that ended the
+        batch (an interrupting speak(), a settings call, shutdown) or None.
+        """
+        jobs = [first]
+        deadline = monotonic() + _SPEAK_COALESCE_SECONDS
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return jobs, None
+            try:
+                job = self._tts_q.get(timeout=remaining)
+            except queue.Empty:
+                return jobs, None
+            if (not isinstance(job, _SpeechJob) or job.interrupt
+                    or job.generation != first.generation):
+                return jobs, job
+            jobs.append(job)
+    
+    def _say(self, engine, jobs: list):
+        """Speak a batch of queued jobs as one utterance, stopping early if interrupted."""
+        generation = jobs[0].generation
+        try:
+            with self._tts_state_lock:
+                if generation != self._tts_generation:
+                    return  # Cancelled while waiting in the queue
+                self.is_speaking = True
+            
+            # End each phrase with punctuation so the joined text keeps its pauses
+            text = " ".join(
+                phrase if phrase.endswith(('.', '!', '?')) else phrase + "."
+                for phrase in (job.text.strip() for job in jobs) if phrase
+            )
+            _log.debug("Speaking: %.50s", text)
+            
+            engine.say(text)
+            engine.startLoop(False)
+            try:
+                while engine.isBusy():
+                    if generation != self._tts_generation:
+                        engine.stop()  # Only reached while the engine is busy
+                        _log.debug("Speech stopped")
+                        break
+                    engine.iterate()
+            finally:
+                engine.endLoop()
+            
+            _log.debug("Speech completed")
+            
+        except Exception as e:
+            _log.warning("TTS error: %s", e)
+        finally:
+            with self._tts_state_lock:
+                self.is_speaking = False
+            for job in jobs:
+                job.done.set()
+    
+    def _call_tts(self, fn: Callable, timeout: float = 5):
+        """Run fn(engine) on the TTS thread and return its result."""
+        if current_thread() is self._tts_thread:
+            return fn(self.tts_engine)
+        future = Future()
+        self._tts_q.put((fn, future))
+        return future.result(timeout=timeout)
+    
+    def _get_mic(self, device_index: Optional[int] = None):
+        """Return the cached Microphone for `device_index`, creating it on first use."""
+        mic = self._mic_by_index.get(device_index)
+        if mic is None:
+            mic = _new_microphone(device_index)
+            self._mic_by_index[device_index] = mic
+        return mic
+    
+    def _current_mic(self):
+        """The selected microphone, defaulting to the system input device."""
+        if self._mic is None:
+            self._mic = self._get_mic()
+        return self._mic
+    
+    def _needs_calibration(self) -> bool:
+        """True until the first calibration, or once recalibrate_every has elapsed."""
+        if not self._calibrated:
+            return True
+        return (self.recalibrate_every is not None
+                and monotonic() - self._calibrated_at >= self.recalibrate_every)
+    
+    def _mark_calibrated(self):
+        self._calibrated = True
+        self._calibrated_at = monotonic()
+    
+    def _ring_buffer(self, samples: int):
+        """Return the reusable int16 capture buffer (a numpy array), growing it if needed."""
+        np = _import_numpy()
+        if self._ring is None or self._ring.size < samples:
+            self._ring = np.empty(samples, dtype=np.int16)
+        return self._ring
+    
+    def _adjust_for_ambient_noise(self, source, duration: float):
+        """
+        Equivalent of Recognizer.adjust_for_ambient_noise() on decimated audio.
+        
+        Reads the same number of chunks, but measures each chunk's RMS on
+        every Nth sample (down to ~8 kHz) in one NumPy pass, then applies
+        the recognizer's usual damped threshold update per chunk.
+        """
+        recognizer = self.recognizer
+        chunk = source.CHUNK
+        seconds_per_buffer = chunk / source.SAMPLE_RATE
+        chunks = int(duration / seconds_per_buffer)
+        if chunks <= 0:
+            return
+        
+        ring = self._ring_buffer(chunks * chunk)
+        for i in range(chunks):
+            samples = np.frombuffer(source.stream.read(chunk), dtype=np.int16)[:chunk]
+            start = i * chunk
+            ring[start:start + samples.size] = samples
+            ring[start + samples.size:start + chunk] = 0  # Pad a short read
+        
+        factor = max(1, source.SAMPLE_RATE // _CALIBRATION_RATE)
+        x = ring[:chunks * chunk].reshape(chunks, chunk)[:, ::factor].astype(np.float32)
+        energies = np.sqrt(np.einsum('ij,ij->i', x, x) / x.shape[1])
+        
+        damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_buffer
+        threshold = recognizer.energy_threshold
+        for target in energies * recognizer.dynamic_energy_ratio:
+            threshold = threshold * damping + target * (1 - damping)
+        recognizer.energy_threshold = float(threshold)
+    
+    def _capture_phrase(self, source, timeout, phrase_limit):
+        """
+        Record one phrase using a 20 ms energy gate.
+        
+        Capture starts at the first frame above the recognizer's energy
+        threshold and stops after _VAD_SILENCE_SECONDS of quiet frames,
+        so the phrase ends without waiting out pause_threshold.
+        """
+        recognizer = self.recognizer
+        frame_len = max(1, int(source.SAMPLE_RATE * _VAD_FRAME_SECONDS))
+        frame_seconds = frame_len / source.SAMPLE_RATE
+        silence_limit = max(1, round(_VAD_SILENCE_SECONDS / frame_seconds))
+        pre_len = max(1, round(_VAD_PRE_ROLL_SECONDS / frame_seconds)) * frame_len
+        
+        # Samples go straight into one preallocated int16 buffer: the first
+        # pre_len samples are a circular pre-roll until speech starts, then
+        # the phrase is appended linearly from there
+        ring = self._ring_buffer(pre_len + int(source.SAMPLE_RATE * phrase_limit) + frame_len)
+        frame_stats = _get_frame_stats()
+        pos = 0
+        filled = 0
+        off = 0
+        elapsed = 0.0
+        speech_start = None
+        silent = 0
+        
+        # Stop early if the caller clears is_listening (push-to-talk release)
+        while self.is_listening:
+            frame = source.stream.read(frame_len)
+            elapsed += frame_seconds
+            samples = np.frombuffer(frame, dtype=np.int16)[:frame_len]
+            n = samples.size
+            if not n:
+                continue
+            sum_sq, crossings = frame_stats(samples)
+            energy = (sum_sq / n) ** 0.5
+            voiced = energy > recognizer.energy_threshold
+            if not voiced and speech_start is not None:
+                # Quiet but noisy frames mid-phrase are usually fricatives, not silence
+                voiced = (energy > recognizer.energy_threshold / 2
+                          and crossings / n > _VAD_FRICATIVE_ZCR)
+            
+            if speech_start is None:
+                ring[pos:pos + n] = samples
+                ring[pos + n:pos + frame_len] = 0  # Pad a short read
+                pos = (pos + frame_len) % pre_len
+                filled = min(filled + frame_len, pre_len)
+                if voiced:
+                    speech_start = elapsed
+                    if filled == pre_len and pos:
+                        # Pre-roll wrapped: rotate it into chronological order once
+                        ring[:pre_len] = np.roll(ring[:pre_len], -pos)
+                    off = filled
+                    continue
+                if elapsed >= timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                if recognizer.dynamic_energy_threshold:
+                    # Same threshold tracking Recognizer.listen() does between phrases
+                    damping = recognizer.dynamic_energy_adjustment_damping ** frame_seconds
+                    target = energy * recognizer.dynamic_energy_ratio
+                    recognizer.energy_threshold = (
+                        recognizer.energy_threshold * damping + target * (1 - damping)
+                    )
+                continue
+            
+            ring[off:off + n] = samples
+            off += n
+            silent = 0 if voiced else silent + 1
+            if (silent >= silence_limit or elapsed - speech_start >= phrase_limit
+                    or off + frame_len > ring.size):
+                break
+        
+        if speech_start is None:
+            raise sr.WaitTimeoutError("listening stopped before a phrase started")
+        return sr.AudioData(ring[:off].tobytes(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+    
+    def _get_vosk_model(self):
+        """Load the Vosk model once; returns None if vosk or the model is unavailable."""
+        if not self._vosk_checked:
+            self._vosk_checked = True
+            if os.path.isdir(self._vosk_model_path):
+                try:
+                    from vosk import Model, SetLogLevel
+                    SetLogLevel(-1)
+                    self._vosk_model = Model(self._vosk_model_path)
+                    _log.debug("Vosk model loaded from %s", self._vosk_model_path)
+                except Exception as e:
+                    _log.warning("Vosk unavailable, using Google speech recognition: %s", e)
+        return self._vosk_model
+    
+    def _recognize_vosk(self, source, model, timeout, phrase_limit, partial_callback):
+        """Stream microphone audio into Vosk until it finalises a phrase."""
+        from vosk import KaldiRecognizer
+        
+        rec = KaldiRecognizer(model, source.SAMPLE_RATE)
+        chunk = 4000  # Frames per read (250 ms at 16 kHz)
+        chunk_seconds = chunk / source.SAMPLE_RATE
+        elapsed = 0.0
+        speech_start = None
+        
+        # Stop early if the caller clears is_listening (push-to-talk release)
+        while self.is_listening:
+            elapsed += chunk_seconds
+            if rec.AcceptWaveform(source.stream.read(chunk)):
+                text = json.loads(rec.Result()).get("text", "")
+                if text:
+                    return text
+            else:
+                partial = json.loads(rec.PartialResult()).get("partial", "")
+                if partial:
+                    if speech_start is None:
+                        speech_start = elapsed
+                    if partial_callback:
+                        partial_callback(partial)
+            
+            if speech_start is None:
+                if elapsed >= timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            elif elapsed - speech_start >= phrase_limit:
+                break
+        
+        text = json.loads(rec.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
     
     def listen(
         self, 
         callback: Callable[[Optional[str], Optional[str]], None], 
         timeout: int = 8,
         phrase_limit: int = 10,
-        language: str = "en-US"
+        language: str = "en-US",
+        partial_callback: Optional[Callable[[str], None]] = None
     ):
         """
         Listen for user speech and call callback with text.
@@ -67,85 +635,97 @@ class VoiceHandler:
             timeout: Maximum seconds to wait for speech (default: 8)
             phrase_limit: Maximum seconds for a single phrase (default: 10)
             language: Language code for recognition (default: "en-US")
+            partial_callback: Called with interim transcripts while the
+                user is still speaking (Vosk only)
         """
-        # CRITICAL FIX: Check if already listening
-        if self.is_listening:
-            print("⚠️ Already listening, ignoring new request")
+        try:
+            _import_speech_recognition()
+        except ImportError as e:
+            _log.warning("Speech recognition unavailable: %s", e)
+            callback(None, "Speech recognition is not available on this device.")
+            return
+        
+        # Check-and-set in one step so two quick calls can't both open the mic
+        if not self._listen_lock.acquire(blocking=False):
+            _log.debug("Already listening, ignoring new request")
             callback(None, "Already listening. Please wait.")
             return
+        self.is_listening = True
         
         def _listen():
-            self.is_listening = True
-            microphone = None
-            
             try:
-                microphone = sr.Microphone()
-                with microphone as source:
-                    print("🎤 Adjusting for ambient noise...")
-                    
-                    # CRITICAL FIX: Add timeout protection for ambient noise adjustment
-                    try:
-                        # Use shorter duration and add error handling
-                        self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                    except Exception as e:
-                        print(f"⚠️ Ambient noise adjustment failed: {e}")
-                        # Continue anyway with default threshold
-                    
-                    print(f"👂 Listening (timeout: {timeout}s)...")
-                    audio = self.recognizer.listen(
-                        source, 
-                        timeout=timeout, 
-                        phrase_time_limit=phrase_limit
-                    )
+                model = self._get_vosk_model()
+                with self._current_mic() as source:
+                    if model:
+                        _log.debug("Listening with Vosk (timeout: %ss)", timeout)
+                        text = self._recognize_vosk(
+                            source, model, timeout, phrase_limit, partial_callback
+                        )
+                    else:
+                        # dynamic_energy_threshold keeps adapting while listening,
+                        # so the initial calibration only has to run once
+                        if self._needs_calibration():
+                            _log.debug("Adjusting for ambient noise")
+                            
+                            # CRITICAL FIX: Add timeout protection for ambient noise adjustment
+                            try:
+                                # Use shorter duration and add error handling
+                                self._adjust_for_ambient_noise(source, duration=0.3)
+                                self._mark_calibrated()
+                            except Exception as e:
+                                _log.warning("Ambient noise adjustment failed: %s", e)
+                                # Continue anyway with default threshold
+                        
+                        _log.debug("Listening (timeout: %ss)", timeout)
+                        audio = self._capture_phrase(source, timeout, phrase_limit)
+                        if audio.sample_rate > _MIC_SAMPLE_RATE:
+                            # Device couldn't open at 16 kHz; don't upload the full-rate audio
+                            audio = sr.AudioData(
+                                audio.get_raw_data(convert_rate=_MIC_SAMPLE_RATE),
+                                _MIC_SAMPLE_RATE, audio.sample_width
+                            )
+                        
+                        _log.debug("Processing speech")
+                        
+                        # Fall back to Google Speech Recognition when no local model is installed
+                        text = self._get_recognize(language)(audio)
+                    _log.debug("Recognized: %s", text)
                     
-                    print("🔄 Processing speech...")
-                    
-                    # Use Google Speech Recognition (free, reliable)
-                    text = self.recognizer.recognize_google(audio, language=language)
-                    print(f"✓ Recognized: {text}")
-                    
-                    self.is_listening = False
-                    callback(text, None)
+                    result = (text, None)
                     
             except sr.WaitTimeoutError:
-                print("⏱️ Listening timeout - no speech detected")
-                self.is_listening = False
-                callback(None, "No speech detected. Please try again.")
+                _log.debug("Listening timeout - no speech detected")
+                result = (None, "No speech detected. Please try again.")
                 
             except sr.UnknownValueError:
-                print("❓ Could not understand audio")
-                self.is_listening = False
-                callback(None, "Sorry, I couldn't understand that. Please speak clearly.")
+                _log.debug("Could not understand audio")
+                result = (None, "Sorry, I couldn't understand that. Please speak clearly.")
                 
             except sr.RequestError as e:
-                print(f"⚠️ Speech recognition service error: {e}")
-                self.is_listening = False
-                callback(None, "Speech recognition service is unavailable right now.")
+                _log.warning("Speech recognition service error: %s", e)
+                result = (None, "Speech recognition service is unavailable right now.")
                 
             except OSError as e:
-                print(f"⚠️ Microphone error: {e}")
-                self.is_listening = False
-                callback(None, "Microphone not available. Please check your device settings.")
+                _log.warning("Microphone error: %s", e)
+                result = (None, "Microphone not available. Please check your device settings.")
                 
             except Exception as e:
-                print(f"❌ Unexpected error during listening: {e}")
-                import traceback
-                traceback.print_exc()
-                self.is_listening = False
-                callback(None, f"An error occurred: {str(e)}")
+                _log.exception("Unexpected error during listening")
+                result = (None, f"An error occurred: {str(e)}")
             finally:
-                # CRITICAL FIX: Always reset listening flag
+                # Always reset the flag and free the lock, before the callback
+                # runs so it can start a new listen() straight away
                 self.is_listening = False
-                # Ensure microphone is released
-                if microphone:
-                    try:
-                        # Microphone should be released by context manager, but ensure it's closed
-                        pass
-                    except:
-                        pass
+                self._listen_lock.release()
+            callback(*result)
         
         # Run in background thread to avoid blocking UI
-        Thread(target=_listen, daemon=True).start()
+        try:
+            self._pool.submit(_listen)
+        except RuntimeError as e:  # Pool already shut down by cleanup()
+            self.is_listening = False
+            self._listen_lock.release()
+            callback(None, f"An error occurred: {str(e)}")
     
     def speak(
         self, 
@@ -161,45 +741,30 @@ class VoiceHandler:
             blocking: If True, wait for speech to complete before returning
             interrupt_current: If True, stop current speech before starting new one
         """
-        if not self.tts_engine:
-            print("⚠️ TTS engine not available")
+        # Don't wait for a starting engine; the job just queues until it's up
+        self._start_tts()
+        if self._tts_ready.is_set() and not self.tts_engine:
+            _log.warning("TTS engine not available")
             return
         
-        # Stop current speech if requested
-        if interrupt_current and self.is_speaking:
+        # Interrupting just cancels older jobs; the TTS thread moves straight on to this one
+        if interrupt_current:
             self.stop_speaking()
-            time.sleep(0.1)  # Brief pause between speeches
-        
-        def _speak():
-            try:
-                self.is_speaking = True
-                print(f"🔊 Speaking: {text[:50]}...")
-                
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-                
-                self.is_speaking = False
-                print("✓ Speech completed")
-                
-            except Exception as e:
-                print(f"⚠️ TTS error: {e}")
-                self.is_speaking = False
         
+        job = _SpeechJob(text, self._tts_generation, Event(), interrupt_current)
+        self._tts_q.put(job)
         if blocking:
-            _speak()
-        else:
-            # Run in background thread
-            Thread(target=_speak, daemon=True).start()
+            # Stop waiting if the TTS thread has exited without reaching the job
+            while not job.done.wait(timeout=0.5):
+                if not self._tts_thread.is_alive():
+                    break
     
     def stop_speaking(self):
         """Stop current speech output immediately."""
-        if self.tts_engine and self.is_speaking:
-            try:
-                self.tts_engine.stop()
-                self.is_speaking = False
-                print("⏹️ Speech stopped")
-            except Exception as e:
-                print(f"⚠️ Error stopping speech: {e}")
+        # Bumping the generation makes the TTS thread stop the current
+        # utterance and skip anything queued before this call
+        with self._tts_state_lock:
+            self._tts_generation += 1
     
     def set_voice_rate(self, rate: int):
         """
@@ -208,12 +773,12 @@ class VoiceHandler:
         Args:
             rate: Words per minute (typical range: 100-300)
         """
-        if self.tts_engine:
+        if self._tts_available():
             try:
-                self.tts_engine.setProperty('rate', rate)
-                print(f"✓ Voice rate set to {rate} wpm")
+                self._call_tts(lambda engine: engine.setProperty('rate', rate))
+                _log.debug("Voice rate set to %s wpm", rate)
             except Exception as e:
-                print(f"⚠️ Error setting voice rate: {e}")
+                _log.warning("Error setting voice rate: %s", e)
     
     def set_voice_volume(self, volume: float):
         """
@@ -222,13 +787,13 @@ class VoiceHandler:
         Args:
             volume: Volume level 0.0 (silent) to 1.0 (maximum)
         """
-        if self.tts_engine:
+        if self._tts_available():
             try:
                 volume = max(0.0, min(1.0, volume))  # Clamp to valid range
-                self.tts_engine.setProperty('volume', volume)
-                print(f"✓ Voice volume set to {volume}")
+                self._call_tts(lambda engine: engine.setProperty('volume', volume))
+                _log.debug("Voice volume set to %s", volume)
             except Exception as e:
-                print(f"⚠️ Error setting voice volume: {e}")
+                _log.warning("Error setting voice volume: %s", e)
     
     def set_voice_gender(self, prefer_female: bool = True):
         """
@@ -237,51 +802,42 @@ class VoiceHandler:
         Args:
             prefer_female: If True, use female voice if available
         """
-        if not self.tts_engine:
+        if not self._tts_available():
             return
         
         try:
-            voices = self.tts_engine.getProperty('voices')
+            voices = self.list_available_voices()
             
             if prefer_female and len(voices) > 1:
-                self.tts_engine.setProperty('voice', voices[1].id)
-                print("✓ Voice set to female")
+                self._call_tts(lambda engine: engine.setProperty('voice', voices[1]['id']))
+                _log.debug("Voice set to female")
             elif len(voices) > 0:
-                self.tts_engine.setProperty('voice', voices[0].id)
-                print("✓ Voice set to male")
+                self._call_tts(lambda engine: engine.setProperty('voice', voices[0]['id']))
+                _log.debug("Voice set to male")
                 
         except Exception as e:
-            print(f"⚠️ Error setting voice gender: {e}")
+            _log.warning("Error setting voice gender: %s", e)
     
-    def list_available_voices(self) -> list:
+    def list_available_voices(self, verbose: bool = False) -> list:
         """
         Get list of available TTS voices.
         
+        The list is read once when the engine starts, so repeated calls
+        don't re-enumerate the system voices.
+        
+        Args:
+            verbose: If True, log each voice
+        
         Returns:
             List of voice information dictionaries
         """
-        if not self.tts_engine:
+        if not self._tts_available() or self._voices_cache is None:
             return []
         
-        try:
-            voices = self.tts_engine.getProperty('voices')
-            voice_list = []
-            
-            for i, voice in enumerate(voices):
-                voice_info = {
-                    'index': i,
-                    'id': voice.id,
-                    'name': voice.name,
-                    'languages': voice.languages if hasattr(voice, 'languages') else []
-                }
-                voice_list.append(voice_info)
-                print(f"Voice {i}: {voice.name}")
-            
-            return voice_list
-            
-        except Exception as e:
-            print(f"⚠️ Error listing voices: {e}")
-            return []
+        if verbose:
+            for voice in self._voices_cache:
+                _log.info("Voice %s: %s", voice['index'], voice['name'])
+        return list(self._voices_cache)
     
     def test_microphone(self) -> bool:
         """
@@ -290,19 +846,26 @@ class VoiceHandler:
         Returns:
             True if microphone is accessible, False otherwise
         """
+        if not self._listen_lock.acquire(blocking=False):
+            # A listen job is inside the shared microphone; an open stream means it works
+            in_use = self._mic is not None and self._mic.stream is not None
+            _log.info("Microphone test skipped while listening (stream open: %s)", in_use)
+            return in_use
         try:
-            print("🎤 Testing microphone...")
-            with sr.Microphone() as source:
-                print("✓ Microphone test: OK")
+            _log.debug("Testing microphone")
+            with self._current_mic() as source:
+                _log.info("Microphone test: OK")
                 return True
                 
         except OSError as e:
-            print(f"✗ Microphone test failed - Device error: {e}")
+            _log.warning("Microphone test failed - Device error: %s", e)
             return False
             
         except Exception as e:
-            print(f"✗ Microphone test failed: {e}")
+            _log.warning("Microphone test failed: %s", e)
             return False
+        finally:
+            self._listen_lock.release()
     
     def test_speaker(self) -> bool:
         """
@@ -312,17 +875,17 @@ class VoiceHandler:
             True if TTS is working, False otherwise
         """
         try:
-            if not self.tts_engine:
-                print("✗ Speaker test failed - TTS engine not initialized")
+            if not self._tts_available():
+                _log.warning("Speaker test failed - TTS engine not initialized")
                 return False
             
-            print("🔊 Testing speaker...")
+            _log.debug("Testing speaker")
             self.speak("Testing speaker. If you hear this, audio is working.", blocking=True)
-            print("✓ Speaker test: OK")
+            _log.info("Speaker test: OK")
             return True
             
         except Exception as e:
-            print(f"✗ Speaker test failed: {e}")
+            _log.warning("Speaker test failed: %s", e)
             return False
     
     def calibrate_microphone(self, duration: float = 2.0):
@@ -332,13 +895,19 @@ class VoiceHandler:
         Args:
             duration: Seconds to listen for ambient noise
         """
+        if not self._listen_lock.acquire(blocking=False):
+            _log.warning("Cannot calibrate while listening")
+            return
         try:
-            print(f"🎤 Calibrating microphone for {duration}s...")
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=duration)
-                print(f"✓ Calibration complete. Energy threshold: {self.recognizer.energy_threshold}")
+            _log.debug("Calibrating microphone for %ss", duration)
+            with self._current_mic() as source:
+                self._adjust_for_ambient_noise(source, duration=duration)
+                self._mark_calibrated()
+                _log.info("Calibration complete. Energy threshold: %s", self.recognizer.energy_threshold)
         except Exception as e:
-            print(f"⚠️ Calibration error: {e}")
+            _log.warning("Calibration error: %s", e)
+        finally:
+            self._listen_lock.release()
     
     def get_microphone_list(self) -> list:
         """
@@ -348,13 +917,19 @@ class VoiceHandler:
             List of microphone names
         """
         try:
-            mic_list = sr.Microphone.list_microphone_names()
-            print(f"📋 Found {len(mic_list)} microphone(s):")
+            try:
+                # One PortAudio query for every device instead of PyAudio's per-device lookups.
+                # All devices are kept so list positions stay valid for set_microphone().
+                import sounddevice
+                mic_list = [device["name"] for device in sounddevice.query_devices()]
+            except Exception:  # sounddevice (or its PortAudio) not installed
+                mic_list = _import_speech_recognition().Microphone.list_microphone_names()
+            _log.info("Found %d microphone(s)", len(mic_list))
             for i, mic in enumerate(mic_list):
-                print(f"  {i}: {mic}")
+                _log.info("  %d: %s", i, mic)
             return mic_list
         except Exception as e:
-            print(f"⚠️ Error listing microphones: {e}")
+            _log.warning("Error listing microphones: %s", e)
             return []
     
     def set_microphone(self, device_index: int):
@@ -364,12 +939,22 @@ class VoiceHandler:
         Args:
             device_index: Index of microphone from get_microphone_list()
         """
+        if not self._listen_lock.acquire(blocking=False):
+            _log.warning("Cannot change microphone while listening")
+            return
         try:
-            # Test the microphone
-            with sr.Microphone(device_index=device_index) as source:
-                print(f"✓ Microphone set to device index {device_index}")
+            # Test the microphone before switching to it
+            mic = self._get_mic(device_index)
+            with mic:
+                pass
+            if mic is not self._mic:
+                self._mic = mic
+                self._calibrated = False  # A different device has a different noise floor
+            _log.info("Microphone set to device index %s", device_index)
         except Exception as e:
-            print(f"⚠️ Error setting microphone: {e}")
+            _log.warning("Error setting microphone: %s", e)
+        finally:
+            self._listen_lock.release()
     
     def get_status(self) -> dict:
         """
@@ -390,6 +975,14 @@ class VoiceHandler:
         """Clean up resources (call when app closes)."""
         try:
             self.stop_speaking()
-            print("✓ Voice handler cleaned up")
+            if self._tts_thread.ident is not None:
+                self._tts_q.put(_SHUTDOWN)
+                self._tts_thread.join(timeout=2)
+            self.tts_engine = None
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            # Streams are closed when each `with` block exits; drop the device handles
+            self._mic_by_index.clear()
+            self._mic = None
+            _log.debug("Voice handler cleaned up")
         except Exception as e:
-            print(f"⚠️ Cleanup error: {e}")
\ No newline at end of file
+            _log.warning("Cleanup error: %s", e)
\ No newline at end of file